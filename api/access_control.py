@@ -5,8 +5,8 @@ Implements RBAC + Purpose-Based Access (Hippocratic Database Model)
 
 from enum import Enum
 from typing import Set, Optional
-from datetime import datetime, timedelta
-from pydantic import BaseModel
+from datetime import datetime, timedelta, timezone
+from pydantic import BaseModel, Field
 
 class Role(str, Enum):
     """User roles in the system"""
@@ -43,7 +43,7 @@ class AccessRequest(BaseModel):
     purpose: Purpose
     data_type: DataType
     patient_id: Optional[str] = None
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class AccessDecision(BaseModel):
     """Result of access control check"""
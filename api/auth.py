@@ -3,7 +3,7 @@ Authentication utilities for BioTeK
 Handles password hashing, JWT tokens, and email verification
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 import bcrypt
 from jose import JWTError, jwt
@@ -23,6 +23,9 @@ AES_KEY = os.environ.get('AES_ENCRYPTION_KEY', secrets.token_bytes(32))
 if isinstance(AES_KEY, str):
     AES_KEY = base64.b64decode(AES_KEY)
 
+# Cipher for the default key, built once instead of on every call
+_DEFAULT_AESGCM = AESGCM(AES_KEY)
+
 def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt
@@ -68,9 +71,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
+        expire = datetime.now(timezone.utc) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -129,43 +132,41 @@ def validate_password_strength(password: str) -> tuple:
     
     return (True, "")
 
-def encrypt_sensitive_data(data: str, key: Optional[bytes] = None) -> str:
+def encrypt_sensitive_bytes(data: bytes, key: Optional[bytes] = None) -> str:
     """
-    Encrypt sensitive data using AES-256-GCM
+    Encrypt raw bytes using AES-256-GCM
     
     Args:
-        data: Data to encrypt
+        data: Bytes to encrypt
         key: Optional 32-byte encryption key (uses default if not provided)
         
     Returns:
         Base64-encoded encrypted data (nonce + ciphertext + tag)
     """
-    encryption_key = key if key else AES_KEY
-    aesgcm = AESGCM(encryption_key)
+    aesgcm = AESGCM(key) if key else _DEFAULT_AESGCM
     
     # Generate random 12-byte nonce (recommended for GCM)
     nonce = os.urandom(12)
     
     # Encrypt the data
-    ciphertext = aesgcm.encrypt(nonce, data.encode('utf-8'), None)
+    ciphertext = aesgcm.encrypt(nonce, data, None)
     
     # Combine nonce + ciphertext and encode as base64
     encrypted = nonce + ciphertext
     return base64.b64encode(encrypted).decode('utf-8')
 
-def decrypt_sensitive_data(encrypted_data: str, key: Optional[bytes] = None) -> str:
+def decrypt_sensitive_bytes(encrypted_data: str, key: Optional[bytes] = None) -> bytes:
     """
-    Decrypt AES-256-GCM encrypted data
+    Decrypt AES-256-GCM encrypted data to raw bytes
     
     Args:
         encrypted_data: Base64-encoded encrypted data
         key: Optional 32-byte decryption key (uses default if not provided)
         
     Returns:
-        Decrypted plaintext data
+        Decrypted plaintext bytes
     """
-    encryption_key = key if key else AES_KEY
-    aesgcm = AESGCM(encryption_key)
+    aesgcm = AESGCM(key) if key else _DEFAULT_AESGCM
     
     # Decode from base64
     encrypted = base64.b64decode(encrypted_data.encode('utf-8'))
@@ -175,5 +176,30 @@ def decrypt_sensitive_data(encrypted_data: str, key: Optional[bytes] = None) ->
     ciphertext = encrypted[12:]
     
     # Decrypt
-    plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-    return plaintext.decode('utf-8')
+    return aesgcm.decrypt(nonce, ciphertext, None)
+
+def encrypt_sensitive_data(data: str, key: Optional[bytes] = None) -> str:
+    """
+    Encrypt sensitive data using AES-256-GCM
+    
+    Args:
+        data: Data to encrypt
+        key: Optional 32-byte encryption key (uses default if not provided)
+        
+    Returns:
+        Base64-encoded encrypted data (nonce + ciphertext + tag)
+    """
+    return encrypt_sensitive_bytes(data.encode('utf-8'), key)
+
+def decrypt_sensitive_data(encrypted_data: str, key: Optional[bytes] = None) -> str:
+    """
+    Decrypt AES-256-GCM encrypted data
+    
+    Args:
+        encrypted_data: Base64-encoded encrypted data
+        key: Optional 32-byte decryption key (uses default if not provided)
+        
+    Returns:
+        Decrypted plaintext data
+    """
+    return decrypt_sensitive_bytes(encrypted_data, key).decode('utf-8')
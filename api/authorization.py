@@ -13,7 +13,7 @@ This module implements hospital-realistic access control:
 
 from enum import Enum
 from typing import Optional, Dict, List, Set, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pydantic import BaseModel, Field
 import uuid
 import json
@@ -21,6 +21,11 @@ import sqlite3
 import os
 from functools import wraps
 
+
+def _utcnow() -> datetime:
+    """Current time as an aware UTC datetime (stored timestamps carry +00:00)"""
+    return datetime.now(timezone.utc)
+
 # =============================================================================
 # ENUMS - Roles, Permissions, Purposes, Actions
 # =============================================================================
@@ -208,7 +213,7 @@ class StaffUser(BaseModel):
     role: Role
     department: Optional[str] = None
     is_active: bool = True
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     created_by: Optional[str] = None
 
 class Encounter(BaseModel):
@@ -220,8 +225,8 @@ class Encounter(BaseModel):
     status: EncounterStatus = EncounterStatus.DRAFT
     purpose: Purpose = Purpose.TREATMENT
     justification: Optional[str] = None
-    started_at: datetime = Field(default_factory=datetime.utcnow)
-    expires_at: datetime = Field(default_factory=lambda: datetime.utcnow() + timedelta(hours=24))
+    started_at: datetime = Field(default_factory=_utcnow)
+    expires_at: datetime = Field(default_factory=lambda: _utcnow() + timedelta(hours=24))
     break_glass_used: bool = False
     break_glass_reason: Optional[str] = None
     break_glass_approved_by: Optional[str] = None
@@ -234,13 +239,13 @@ class PatientConsent(BaseModel):
     consent_ai_analysis: bool = True  # Default true for basic AI
     consent_research: bool = False
     policy_version: str = "1.0"
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
     updated_by: Optional[str] = None
 
 class AuditLog(BaseModel):
     """Immutable audit log entry"""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     actor_user_id: str
     actor_role: Role
     patient_id: Optional[str] = None
@@ -676,7 +681,7 @@ class AuthorizationEngine:
             status=EncounterStatus.ACTIVE,
             purpose=purpose,
             justification=f"BREAK-GLASS: {reason}",
-            expires_at=datetime.utcnow() + timedelta(hours=4),  # Short expiry
+            expires_at=_utcnow() + timedelta(hours=4),  # Short expiry
             break_glass_used=True,
             break_glass_reason=reason
         )
@@ -814,7 +819,10 @@ class AuthorizationEngine:
             
             # Check encounter hasn't expired
             expires_at = datetime.fromisoformat(encounter.get('expires_at', '2000-01-01'))
-            if expires_at < datetime.utcnow():
+            if expires_at.tzinfo is None:
+                # Encounters stored before timestamps were aware hold naive UTC
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            if expires_at < _utcnow():
                 audit_log.reason = "Encounter has expired"
                 self.log_audit(audit_log)
                 return AuthorizationResult(
@@ -8,12 +8,16 @@ Features:
 """
 
 import os
+import time
+import random
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import base64
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
 # =============================================================================
@@ -37,6 +41,43 @@ class CloudModelConfig:
         )
 
 
+# Keep-alive connections held per host by the shared HTTP session
+HTTP_POOL_SIZE = int(os.getenv("CLOUD_HTTP_POOL_SIZE", "32"))
+
+
+def create_http_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Create a requests session that reuses TLS connections across calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Transient failures (rate limits, server errors, dropped connections) are
+# retried with exponential backoff and jitter; 4xx client errors are not
+HTTP_MAX_ATTEMPTS = int(os.getenv("CLOUD_HTTP_MAX_ATTEMPTS", "3"))
+HTTP_BACKOFF_INITIAL = 0.5
+HTTP_BACKOFF_MAX = 8.0
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def post_with_retry(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """POST, retrying transient errors; returns the last response"""
+    for attempt in range(HTTP_MAX_ATTEMPTS):
+        last = attempt == HTTP_MAX_ATTEMPTS - 1
+        try:
+            response = session.post(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last:
+                raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS or last:
+                return response
+        delay = min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_INITIAL * 2 ** attempt)
+        time.sleep(delay + random.uniform(0, HTTP_BACKOFF_INITIAL))
+
+
 # =============================================================================
 # EVO 2 - DNA FOUNDATION MODEL (NVIDIA NIM)
 # =============================================================================
@@ -52,10 +93,11 @@ class Evo2Client:
     - Mutation impact scoring
     """
     
-    def __init__(self, config: CloudModelConfig):
+    def __init__(self, config: CloudModelConfig, session: Optional[requests.Session] = None):
         self.api_key = config.nvidia_nim_api_key
         self.base_url = "https://health.api.nvidia.com/v1"
         self.model = "arc/evo2-40b"
+        self.session = session or create_http_session()
         
     def _make_request(self, endpoint: str, payload: Dict) -> Dict:
         """Make request to NVIDIA NIM API"""
@@ -67,7 +109,8 @@ class Evo2Client:
             "Content-Type": "application/json"
         }
         
-        response = requests.post(
+        response = post_with_retry(
+            self.session,
             f"{self.base_url}/{endpoint}",
             headers=headers,
             json=payload,
@@ -205,9 +248,37 @@ class Evo2Client:
             "organism_bias": organism,
             "temperature": temperature,
             "model": self.model,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
+    def analyze_sequences(
+        self,
+        sequences: List[str],
+        max_concurrency: int = 4,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Analyze several DNA sequences in one call
+        
+        The NIM generate endpoint takes a single sequence per request, so the
+        requests are issued concurrently (at most max_concurrency at a time).
+        
+        Returns:
+            One analyze_sequence() result per input, in order; entries that
+            failed hold the raised exception instead
+        """
+        def analyze(sequence: str) -> Any:
+            try:
+                return self.analyze_sequence(sequence, **kwargs)
+            except Exception as e:
+                return e
+        
+        if len(sequences) <= 1:
+            return [analyze(sequence) for sequence in sequences]
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(sequences))) as pool:
+            return list(pool.map(analyze, sequences))
+    
     def predict_variant_effect(
         self, 
         reference_seq: str, 
@@ -240,7 +311,7 @@ class Evo2Client:
             "variant_embedding": var_result.get("embeddings"),
             "analysis": "Variant effect analysis completed",
             "model": self.model,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     def generate_sequence(
@@ -274,7 +345,7 @@ class Evo2Client:
             "generated": result.get("choices", [{}])[0].get("text", ""),
             "full_sequence": prompt_sequence + result.get("choices", [{}])[0].get("text", ""),
             "model": self.model,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 
@@ -293,10 +364,11 @@ class GLM45VClient:
     - Report generation from imaging
     """
     
-    def __init__(self, config: CloudModelConfig):
+    def __init__(self, config: CloudModelConfig, session: Optional[requests.Session] = None):
         self.api_key = config.openrouter_api_key
         self.base_url = config.openrouter_base_url
         self.model = "z-ai/glm-4.5v"
+        self.session = session or create_http_session()
         
     def _make_request(self, messages: List[Dict], reasoning: bool = False, max_tokens: int = 2000) -> Dict:
         """Make request to OpenRouter API"""
@@ -317,7 +389,8 @@ class GLM45VClient:
             "reasoning": {"enabled": reasoning}  # Enable o1-style thinking
         }
         
-        response = requests.post(
+        response = post_with_retry(
+            self.session,
             f"{self.base_url}/chat/completions",
             headers=headers,
             json=payload,
@@ -397,7 +470,7 @@ Important: This is for clinical decision support only. Final diagnosis must be m
             "model": self.model,
             "clinical_question": clinical_question,
             "disclaimer": "AI-assisted analysis for clinical decision support only",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     def analyze_clinical_document(
@@ -453,7 +526,7 @@ Please provide structured output with:
             "extraction_focus": extraction_focus,
             "extracted_data": result.get("choices", [{}])[0].get("message", {}).get("content", ""),
             "model": self.model,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     def visual_clinical_qa(
@@ -492,7 +565,7 @@ Please provide structured output with:
             "question": question,
             "answer": result.get("choices", [{}])[0].get("message", {}).get("content", ""),
             "model": self.model,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     # =========================================================================
@@ -568,7 +641,7 @@ If no abnormalities are found, state "No significant abnormalities detected" and
             "target_findings": target_findings,
             "model": self.model,
             "feature": "grounding",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     def _parse_bounding_boxes(self, text: str) -> List[Dict]:
@@ -668,7 +741,7 @@ Include confidence percentages for your top diagnoses."""
             "thinking_mode": True,
             "model": self.model,
             "feature": "deep_diagnosis",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     # =========================================================================
@@ -744,7 +817,7 @@ Do not include disclaimers. Focus on actionable insights."""
             "risk_summary": {"percentage": risk_pct, "category": risk_cat},
             "model": self.model,
             "feature": "text_generation",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     # =========================================================================
@@ -819,7 +892,7 @@ Label images as Image 1, Image 2, etc. in chronological order."""
             "clinical_context": clinical_context,
             "model": self.model,
             "feature": "multi_image_comparison",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     # =========================================================================
@@ -890,7 +963,7 @@ Provide:
             "clinical_focus": clinical_focus,
             "model": self.model,
             "feature": "video_analysis",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     # =========================================================================
@@ -999,7 +1072,7 @@ Flag any critical or abnormal values that require immediate attention."""
             "extraction_successful": structured_data is not None,
             "model": self.model,
             "feature": "document_parsing",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 
@@ -1018,21 +1091,26 @@ class BioTekCloudClient:
     
     def __init__(self, config: CloudModelConfig = None):
         self.config = config or CloudModelConfig.from_env()
+        self.session = create_http_session()
         self._evo2 = None
         self._glm45v = None
     
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self.session.close()
+    
     @property
     def evo2(self) -> Evo2Client:
         """Get Evo 2 client (lazy initialization)"""
         if self._evo2 is None:
-            self._evo2 = Evo2Client(self.config)
+            self._evo2 = Evo2Client(self.config, self.session)
         return self._evo2
     
     @property
     def vision(self) -> GLM45VClient:
         """Get GLM-4.5V vision client (lazy initialization)"""
         if self._glm45v is None:
-            self._glm45v = GLM45VClient(self.config)
+            self._glm45v = GLM45VClient(self.config, self.session)
         return self._glm45v
     
     def check_api_status(self) -> Dict[str, Any]:
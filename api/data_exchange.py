@@ -6,10 +6,26 @@ with consent management and complete audit trails (HIPAA compliant)
 
 import json
 import hashlib
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from enum import Enum
-from auth import encrypt_sensitive_data, decrypt_sensitive_data
+from auth import encrypt_sensitive_bytes, decrypt_sensitive_bytes
+
+# MessagePack is optional - exchanges fall back to JSON without it
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+# One-byte format tag at the start of the (authenticated) plaintext
+FORMAT_MSGPACK = b"M"
+FORMAT_JSON = b"J"
+
+# How long a sent package stays valid for the recipient (same window the
+# recipient has to respond to an exchange request)
+EXCHANGE_PACKAGE_TTL = timedelta(days=7)
 
 class ExchangeStatus(str, Enum):
     """Status of data exchange request"""
@@ -32,12 +48,56 @@ class DataCategory(str, Enum):
     PREDICTIONS = "predictions"
     FULL_RECORD = "full_record"
 
+# Value -> member lookup used when deserializing category lists
+_CATEGORY_BY_VALUE = DataCategory._value2member_map_
+
+def parse_categories(values: List[str]) -> List[DataCategory]:
+    """
+    Convert serialized category values back to DataCategory members
+    
+    Args:
+        values: Category value strings (e.g. from a stored request or package)
+        
+    Returns:
+        List of DataCategory members
+    """
+    try:
+        return [_CATEGORY_BY_VALUE[value] for value in values]
+    except KeyError as e:
+        raise ValueError(f"{e.args[0]!r} is not a valid DataCategory") from None
+
 def create_exchange_id() -> str:
     """Generate unique exchange ID"""
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     random_str = hashlib.sha256(timestamp.encode()).hexdigest()[:12]
     return f"EXC-{random_str.upper()}"
 
+def encode_exchange_payload(data: Any) -> bytes:
+    """
+    Serialize exchange data with its format tag
+    
+    MessagePack is used when available (smaller and faster to parse than
+    JSON for numeric clinical records); JSON otherwise.
+    """
+    if MSGPACK_AVAILABLE:
+        return FORMAT_MSGPACK + msgpack.packb(data, use_bin_type=True)
+    return FORMAT_JSON + json.dumps(data).encode('utf-8')
+
+def decode_exchange_payload(payload: bytes) -> Any:
+    """
+    Deserialize exchange data produced by encode_exchange_payload
+    
+    Untagged payloads from older senders are plain JSON.
+    """
+    tag, body = payload[:1], payload[1:]
+    if tag == FORMAT_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Received MessagePack exchange data but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if tag == FORMAT_JSON:
+        return json.loads(body)
+    return json.loads(payload)
+
 def encrypt_data_for_exchange(data: Dict[str, Any], recipient_key: Optional[str] = None) -> str:
     """
     Encrypt patient data for secure transmission using AES-256-GCM
@@ -49,9 +109,9 @@ def encrypt_data_for_exchange(data: Dict[str, Any], recipient_key: Optional[str]
     Returns:
         Encrypted data (base64 encoded)
     """
-    # Convert dict to JSON string and encrypt with AES-256-GCM
-    json_data = json.dumps(data, indent=2)
-    encrypted = encrypt_sensitive_data(json_data)
+    # Serialize (format tag included) and encrypt with AES-256-GCM,
+    # so the tag is covered by the GCM authentication tag
+    encrypted = encrypt_sensitive_bytes(encode_exchange_payload(data))
     
     return encrypted
 
@@ -66,9 +126,9 @@ def decrypt_received_data(encrypted_data: str, private_key: Optional[str] = None
     Returns:
         Decrypted patient data
     """
-    # Decrypt with AES-256-GCM and parse JSON
-    decrypted = decrypt_sensitive_data(encrypted_data)
-    data = json.loads(decrypted)
+    # Decrypt with AES-256-GCM and deserialize according to the format tag
+    decrypted = decrypt_sensitive_bytes(encrypted_data)
+    data = decode_exchange_payload(decrypted)
     
     return data
 
@@ -169,18 +229,19 @@ def create_exchange_package(
     minimized_data = minimize_data(patient_data, categories)
     
     # Create package metadata
+    now = datetime.now(timezone.utc)
     package = {
         "exchange_id": exchange_id,
         "sender_institution": sender_institution,
         "recipient_institution": recipient_institution,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "purpose": purpose,
         "categories": [cat.value for cat in categories],
         "data": minimized_data,
         "metadata": {
             "patient_id": patient_data.get("patient_id"),
-            "created_at": datetime.now().isoformat(),
-            "expires_at": (datetime.now()).isoformat(),  # Set appropriate expiry
+            "created_at": now.isoformat(),
+            "expires_at": (now + EXCHANGE_PACKAGE_TTL).isoformat(),
             "hipaa_compliant": True,
             "encryption": "AES-256-GCM",  # In production
             "signature": "SHA-256-RSA"     # In production
@@ -189,6 +250,83 @@ def create_exchange_package(
     
     return package
 
+def create_exchange_packages(
+    patient_data_list: List[Dict[str, Any]],
+    exchange_id: str,
+    sender_institution: str,
+    recipient_institution: str,
+    purpose: str,
+    categories: List[DataCategory]
+) -> Dict[str, Any]:
+    """
+    Create a single exchange package carrying many patients
+    
+    The whole batch is serialized and encrypted once by
+    encrypt_data_for_exchange instead of once per patient; the recipient
+    reads it back with open_exchange_packages.
+    
+    Args:
+        patient_data_list: Patient records to send
+        exchange_id: Unique exchange ID
+        sender_institution: Sending institution ID
+        recipient_institution: Receiving institution ID
+        purpose: Purpose of exchange
+        categories: Data categories being sent (same for every patient)
+        
+    Returns:
+        Batch exchange package
+    """
+    now = datetime.now(timezone.utc)
+    
+    exchanges = [
+        {
+            "patient_id": patient_data.get("patient_id"),
+            "data": minimize_data(patient_data, categories)
+        }
+        for patient_data in patient_data_list
+    ]
+    
+    return {
+        "exchange_id": exchange_id,
+        "sender_institution": sender_institution,
+        "recipient_institution": recipient_institution,
+        "timestamp": now.isoformat(),
+        "purpose": purpose,
+        "categories": [cat.value for cat in categories],
+        "exchanges": exchanges,
+        "metadata": {
+            "patient_count": len(exchanges),
+            "created_at": now.isoformat(),
+            "expires_at": (now + EXCHANGE_PACKAGE_TTL).isoformat(),
+            "hipaa_compliant": True,
+            "encryption": "AES-256-GCM",  # In production
+            "signature": "SHA-256-RSA"     # In production
+        }
+    }
+
+def open_exchange_packages(encrypted_data: str, private_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Decrypt a batch package from create_exchange_packages (one decryption
+    for the whole batch)
+    
+    Args:
+        encrypted_data: Output of encrypt_data_for_exchange for the batch
+        private_key: Institution's private key (reserved for future RSA hybrid)
+        
+    Returns:
+        Per-patient records ({"patient_id", "data"}) in the order sent
+        
+    Raises:
+        ValueError: If the package has expired
+    """
+    package = decrypt_received_data(encrypted_data, private_key)
+    
+    expires_at = datetime.fromisoformat(package["metadata"]["expires_at"])
+    if expires_at < datetime.now(timezone.utc):
+        raise ValueError(f"Exchange package {package['exchange_id']} expired at {expires_at.isoformat()}")
+    
+    return package["exchanges"]
+
 def verify_exchange_signature(package: Dict[str, Any], public_key: Optional[str] = None) -> bool:
     """
     Verify digital signature of exchange package
@@ -235,7 +373,7 @@ def log_exchange_event(
         "event_type": event_type,
         "details": details,
         "user_id": user_id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 def check_patient_consent_for_sharing(
@@ -265,8 +403,9 @@ def check_patient_consent_for_sharing(
     
     # Check expiration
     if "expires_at" in consent:
-        expiry = datetime.fromisoformat(consent["expires_at"])
-        if expiry < datetime.now():
+        # Naive expiries (older records) are local time
+        expiry = datetime.fromisoformat(consent["expires_at"]).astimezone(timezone.utc)
+        if expiry < datetime.now(timezone.utc):
             return False
     
     return True
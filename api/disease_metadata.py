@@ -8,34 +8,36 @@ This ensures:
 3. Full transparency about data sources and limitations
 """
 
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Tuple, Mapping, FrozenSet
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import StrEnum
 
-class DatasetType(str, Enum):
+class DatasetType(StrEnum):
     REAL = "real"
     SYNTHETIC = "synthetic"
     CLINICAL_SYNTHETIC = "clinical_synthetic"  # Based on validated clinical equations
     MIXED = "mixed"
 
-class ApplicabilityStatus(str, Enum):
+class ApplicabilityStatus(StrEnum):
     APPLICABLE = "applicable"
     NOT_APPLICABLE = "not_applicable"
     INSUFFICIENT_DATA = "insufficient_data"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiseaseMetadata:
-    """Metadata for a disease prediction model"""
+    """Metadata for a disease prediction model (immutable, hashable)"""
     disease_id: str
     display_name: str
     
     # Applicability gates
-    applicable_sexes: List[int]  # 0=Female, 1=Male, [0,1]=Both
+    applicable_sexes: Tuple[int, ...]  # 0=Female, 1=Male, (0, 1)=Both
     min_age: int = 18
     max_age: int = 100
     
     # Feature provenance
-    features_used: List[str] = field(default_factory=list)
+    features_used: Tuple[str, ...] = ()
     includes_sex: bool = False  # Does the model actually use sex?
     
     # Dataset info
@@ -49,7 +51,7 @@ class DiseaseMetadata:
     calibrated: bool = False
     
     # Clinical notes
-    icd10_codes: List[str] = field(default_factory=list)
+    icd10_codes: Tuple[str, ...] = ()
     clinical_notes: Optional[str] = None
 
 # =============================================================================
@@ -57,18 +59,17 @@ class DiseaseMetadata:
 # =============================================================================
 
 # Base features available for all models (excluding sex)
-BASE_FEATURES = [
+BASE_FEATURES = (
     'age', 'bmi', 'bp_systolic', 'bp_diastolic',
     'total_cholesterol', 'hdl', 'ldl', 'triglycerides',
     'hba1c', 'egfr', 'smoking', 'family_history'
-]
+)
 
-# Features including sex (only for models with real sex-stratified data)
-FEATURES_WITH_SEX = ['age', 'sex', 'bmi', 'bp_systolic', 'bp_diastolic',
-                     'total_cholesterol', 'hdl', 'ldl', 'triglycerides',
-                     'hba1c', 'egfr', 'smoking', 'family_history']
+# Features including sex (only for models with real sex-stratified data);
+# built from BASE_FEATURES so both share the same name objects
+FEATURES_WITH_SEX = BASE_FEATURES[:1] + ('sex',) + BASE_FEATURES[1:]
 
-DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
+DISEASE_METADATA: Mapping[str, DiseaseMetadata] = MappingProxyType({
     # =========================================================================
     # REAL DATASETS WITH SEX-STRATIFIED DATA
     # =========================================================================
@@ -76,7 +77,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
     "type2_diabetes": DiseaseMetadata(
         disease_id="type2_diabetes",
         display_name="Type 2 Diabetes",
-        applicable_sexes=[0, 1],  # Both
+        applicable_sexes=(0, 1),  # Both
         features_used=FEATURES_WITH_SEX,
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -85,14 +86,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.85,
         calibrated=True,
-        icd10_codes=["E11"],
+        icd10_codes=("E11",),
         clinical_notes="FINDRISC-based with ML enhancement"
     ),
     
     "coronary_heart_disease": DiseaseMetadata(
         disease_id="coronary_heart_disease",
         display_name="Coronary Heart Disease",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -101,14 +102,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.87,
         calibrated=True,
-        icd10_codes=["I25"],
+        icd10_codes=("I25",),
         clinical_notes="Framingham-validated features"
     ),
     
     "stroke": DiseaseMetadata(
         disease_id="stroke",
         display_name="Stroke",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -117,14 +118,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.82,
         calibrated=True,
-        icd10_codes=["I63", "I64"],
+        icd10_codes=("I63", "I64"),
         clinical_notes="Includes lifestyle factors"
     ),
     
     "heart_failure": DiseaseMetadata(
         disease_id="heart_failure",
         display_name="Heart Failure",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -133,14 +134,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.78,
         calibrated=True,
-        icd10_codes=["I50"],
+        icd10_codes=("I50",),
         clinical_notes="Mortality prediction dataset"
     ),
     
     "nafld": DiseaseMetadata(
         disease_id="nafld",
         display_name="Non-Alcoholic Fatty Liver Disease",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -149,14 +150,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.72,
         calibrated=True,
-        icd10_codes=["K76.0"],
+        icd10_codes=("K76.0",),
         clinical_notes="Fatty Liver Index (FLI) features"
     ),
     
     "hypertension": DiseaseMetadata(
         disease_id="hypertension",
         display_name="Hypertension",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -165,7 +166,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.80,
         calibrated=True,
-        icd10_codes=["I10"],
+        icd10_codes=("I10",),
         clinical_notes="BP-based diagnostic criteria apply"
     ),
     
@@ -176,7 +177,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
     "breast_cancer": DiseaseMetadata(
         disease_id="breast_cancer",
         display_name="Breast Cancer",
-        applicable_sexes=[0],  # Female only (for demo - male BC exists but rare)
+        applicable_sexes=(0,),  # Female only (for demo - male BC exists but rare)
         min_age=25,
         features_used=BASE_FEATURES,  # NO SEX - Wisconsin dataset is all female
         includes_sex=False,
@@ -186,14 +187,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=False,  # All female in dataset
         reported_auc=0.95,
         calibrated=True,
-        icd10_codes=["C50"],
+        icd10_codes=("C50",),
         clinical_notes="Tumor cell features only. Male breast cancer (~1% of cases) not modeled."
     ),
     
     "chronic_kidney_disease": DiseaseMetadata(
         disease_id="chronic_kidney_disease",
         display_name="Chronic Kidney Disease",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=BASE_FEATURES,  # NO SEX - not in original dataset
         includes_sex=False,
         dataset_type=DatasetType.REAL,
@@ -202,7 +203,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=False,
         reported_auc=0.98,
         calibrated=True,
-        icd10_codes=["N18"],
+        icd10_codes=("N18",),
         clinical_notes="eGFR-based staging applies"
     ),
     
@@ -213,7 +214,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
     "colorectal_cancer": DiseaseMetadata(
         disease_id="colorectal_cancer",
         display_name="Colorectal Cancer",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         min_age=40,
         features_used=FEATURES_WITH_SEX,  # CRC risk model includes sex
         includes_sex=True,
@@ -223,14 +224,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.82,
         calibrated=True,
-        icd10_codes=["C18", "C19", "C20"],
+        icd10_codes=("C18", "C19", "C20"),
         clinical_notes="Based on NCI CRC Risk Assessment Tool factors"
     ),
     
     "alzheimers_disease": DiseaseMetadata(
         disease_id="alzheimers_disease",
         display_name="Alzheimer's Disease",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         min_age=50,
         features_used=FEATURES_WITH_SEX,  # Real OASIS data has sex
         includes_sex=True,
@@ -240,14 +241,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.78,
         calibrated=True,
-        icd10_codes=["G30"],
+        icd10_codes=("G30",),
         clinical_notes="Real OASIS data - CDR-based cognitive assessment"
     ),
     
     "copd": DiseaseMetadata(
         disease_id="copd",
         display_name="COPD",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,  # Real Kaggle data has sex
         includes_sex=True,
         dataset_type=DatasetType.REAL,
@@ -256,14 +257,14 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.82,
         calibrated=True,
-        icd10_codes=["J44"],
+        icd10_codes=("J44",),
         clinical_notes="Real clinical data - FEV1/GOLD staging"
     ),
     
     "atrial_fibrillation": DiseaseMetadata(
         disease_id="atrial_fibrillation",
         display_name="Atrial Fibrillation",
-        applicable_sexes=[0, 1],
+        applicable_sexes=(0, 1),
         features_used=FEATURES_WITH_SEX,  # CHARGE-AF includes sex
         includes_sex=True,
         dataset_type=DatasetType.CLINICAL_SYNTHETIC,
@@ -272,7 +273,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=True,
         reported_auc=0.79,
         calibrated=True,
-        icd10_codes=["I48"],
+        icd10_codes=("I48",),
         clinical_notes="Based on validated CHARGE-AF 5-year risk equation"
     ),
     
@@ -283,7 +284,7 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
     "prostate_cancer": DiseaseMetadata(
         disease_id="prostate_cancer",
         display_name="Prostate Cancer",
-        applicable_sexes=[1],  # Male only
+        applicable_sexes=(1,),  # Male only
         min_age=40,
         features_used=BASE_FEATURES,  # NO SEX - all patients are male
         includes_sex=False,
@@ -293,16 +294,49 @@ DISEASE_METADATA: Dict[str, DiseaseMetadata] = {
         sex_stratified=False,  # All male
         reported_auc=0.85,
         calibrated=True,
-        icd10_codes=["C61"],
+        icd10_codes=("C61",),
         clinical_notes="Male-only. PSA and Gleason score based risk."
     ),
-}
+})  # Read-only view: the registry never changes after import
+
+
+def get_disease(disease_id: str) -> Optional[DiseaseMetadata]:
+    """Look up a disease's metadata (None if unknown)"""
+    return DISEASE_METADATA.get(disease_id)
+
+
+# Per-disease gates resolved once at import: (min_age, max_age, sexes, display_name)
+_APPLICABILITY_FAST: Mapping[str, Tuple[int, int, FrozenSet[int], str]] = MappingProxyType({
+    disease_id: (meta.min_age, meta.max_age, frozenset(meta.applicable_sexes), meta.display_name)
+    for disease_id, meta in DISEASE_METADATA.items()
+})
+
+_SEX_NAME: Mapping[int, str] = MappingProxyType({0: "female", 1: "male"})
+
+# "female, male" style lists for the sex_not_applicable message
+_APPLICABLE_SEX_NAMES: Mapping[str, str] = MappingProxyType({
+    disease_id: ", ".join(_SEX_NAME[s] for s in meta.applicable_sexes)
+    for disease_id, meta in DISEASE_METADATA.items()
+})
+
+# Shared "applicable" results, one per disease; callers must treat them read-only
+_APPLICABLE_OK: Mapping[str, Dict[str, Any]] = MappingProxyType({
+    disease_id: {
+        "status": ApplicabilityStatus.APPLICABLE,
+        "reason": None,
+        "can_predict": True,
+        "metadata": meta
+    }
+    for disease_id, meta in DISEASE_METADATA.items()
+})
 
 
 def check_applicability(disease_id: str, patient_sex: int, patient_age: int) -> Dict[str, Any]:
     """
     Check if a disease prediction is applicable for a given patient.
     
+    The applicable result is a shared dict; copy it before modifying.
+    
     Returns:
         {
             "status": "applicable" | "not_applicable" | "insufficient_data",
@@ -311,9 +345,9 @@ def check_applicability(disease_id: str, patient_sex: int, patient_age: int) ->
             "metadata": DiseaseMetadata or None
         }
     """
-    metadata = DISEASE_METADATA.get(disease_id)
+    gates = _APPLICABILITY_FAST.get(disease_id)
     
-    if not metadata:
+    if gates is None:
         return {
             "status": ApplicabilityStatus.INSUFFICIENT_DATA,
             "reason": f"No metadata found for disease: {disease_id}",
@@ -321,55 +355,53 @@ def check_applicability(disease_id: str, patient_sex: int, patient_age: int) ->
             "metadata": None
         }
     
+    min_age, max_age, sexes, display_name = gates
+    if patient_sex in sexes and min_age <= patient_age <= max_age:
+        return _APPLICABLE_OK[disease_id]
+    
+    metadata = DISEASE_METADATA[disease_id]
+    
     # Check sex applicability
-    if patient_sex not in metadata.applicable_sexes:
-        sex_name = "male" if patient_sex == 1 else "female"
-        applicable_names = ["female" if s == 0 else "male" for s in metadata.applicable_sexes]
+    if patient_sex not in sexes:
+        sex_name = _SEX_NAME.get(patient_sex, "female")
         return {
             "status": ApplicabilityStatus.NOT_APPLICABLE,
             "reason": f"sex_not_applicable",
-            "reason_detail": f"{metadata.display_name} prediction not applicable for {sex_name} patients. Applicable for: {', '.join(applicable_names)}",
+            "reason_detail": f"{display_name} prediction not applicable for {sex_name} patients. Applicable for: {_APPLICABLE_SEX_NAMES[disease_id]}",
             "can_predict": False,
             "metadata": metadata
         }
     
     # Check age applicability
-    if patient_age < metadata.min_age:
+    if patient_age < min_age:
         return {
             "status": ApplicabilityStatus.NOT_APPLICABLE,
             "reason": "age_below_minimum",
-            "reason_detail": f"{metadata.display_name} prediction requires age >= {metadata.min_age}",
-            "can_predict": False,
-            "metadata": metadata
-        }
-    
-    if patient_age > metadata.max_age:
-        return {
-            "status": ApplicabilityStatus.NOT_APPLICABLE,
-            "reason": "age_above_maximum",
-            "reason_detail": f"{metadata.display_name} prediction not validated for age > {metadata.max_age}",
+            "reason_detail": f"{display_name} prediction requires age >= {min_age}",
             "can_predict": False,
             "metadata": metadata
         }
     
     return {
-        "status": ApplicabilityStatus.APPLICABLE,
-        "reason": None,
-        "can_predict": True,
+        "status": ApplicabilityStatus.NOT_APPLICABLE,
+        "reason": "age_above_maximum",
+        "reason_detail": f"{display_name} prediction not validated for age > {max_age}",
+        "can_predict": False,
         "metadata": metadata
     }
 
 
-def get_features_for_disease(disease_id: str) -> List[str]:
+def get_features_for_disease(disease_id: str) -> Tuple[str, ...]:
     """Get the feature list for a specific disease model"""
-    metadata = DISEASE_METADATA.get(disease_id)
+    metadata = get_disease(disease_id)
     if metadata:
         return metadata.features_used
     return BASE_FEATURES  # Default fallback
 
 
+@lru_cache(maxsize=1)
 def get_all_metadata() -> Dict[str, Dict]:
-    """Export all metadata as JSON-serializable dict"""
+    """Export all metadata as JSON-serializable dict (built once; do not modify)"""
     result = {}
     for disease_id, meta in DISEASE_METADATA.items():
         result[disease_id] = {
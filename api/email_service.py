@@ -4,8 +4,14 @@ Handles sending emails for password resets, account activation, etc.
 """
 
 import os
-from typing import Optional
-from datetime import datetime
+import smtplib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, List, Tuple, Union
+from datetime import datetime, timezone
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from string import Template
 
 # In production, use environment variables
 EMAIL_ENABLED = os.getenv("EMAIL_ENABLED", "false").lower() == "true"
@@ -16,6 +22,73 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
 FROM_EMAIL = os.getenv("FROM_EMAIL", "noreply@biotek.local")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
+# One authenticated SMTP connection per thread, reused across emails
+_smtp_local = threading.local()
+
+
+def _smtp_connect() -> smtplib.SMTP:
+    """Open and authenticate a new SMTP connection"""
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+    server.starttls()
+    server.login(SMTP_USER, SMTP_PASSWORD)
+    return server
+
+
+def _drop_smtp_connection() -> None:
+    """Discard this thread's SMTP connection (reconnects on next send)"""
+    server = getattr(_smtp_local, "server", None)
+    _smtp_local.server = None
+    if server is not None:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def _smtp_session() -> smtplib.SMTP:
+    """Get this thread's connection, checked with NOOP before it is reused"""
+    server = getattr(_smtp_local, "server", None)
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except smtplib.SMTPException:
+            pass
+        _drop_smtp_connection()
+    server = _smtp_local.server = _smtp_connect()
+    return server
+
+
+def _smtp_send(msg: MIMEMultipart) -> None:
+    """Send over this thread's pooled connection, reconnecting once if the server hung up"""
+    server = getattr(_smtp_local, "server", None)
+    if server is None:
+        server = _smtp_local.server = _smtp_connect()
+    try:
+        server.send_message(msg)
+    except smtplib.SMTPServerDisconnected:
+        # Idle connections get closed server-side; retry on a fresh one
+        _drop_smtp_connection()
+        server = _smtp_local.server = _smtp_connect()
+        server.send_message(msg)
+
+
+def _build_message(to_email: str, subject: str, body: str, html_body: Optional[str]) -> MIMEMultipart:
+    """Build a multipart (plain text + optional HTML) message"""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = FROM_EMAIL
+    msg['To'] = to_email
+    
+    # Attach plain text
+    msg.attach(MIMEText(body, 'plain'))
+    
+    # Attach HTML if provided
+    if html_body:
+        msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+
 def send_email(to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> bool:
     """
     Send an email
@@ -35,48 +108,68 @@ def send_email(to_email: str, subject: str, body: str, html_body: Optional[str]
         return True
     
     try:
-        import smtplib
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
-        
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = FROM_EMAIL
-        msg['To'] = to_email
-        
-        # Attach plain text
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Attach HTML if provided
-        if html_body:
-            msg.attach(MIMEText(html_body, 'html'))
-        
-        # Send via SMTP
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(msg)
-        
+        # Send via the pooled SMTP connection
+        _smtp_send(_build_message(to_email, subject, body, html_body))
         return True
     except Exception as e:
+        _drop_smtp_connection()
         print(f"❌ Email send failed: {e}")
         return False
 
 
-def send_password_reset_email(to_email: str, reset_token: str, user_type: str) -> bool:
-    """Send password reset email"""
-    
-    reset_url = f"{FRONTEND_URL}/reset-password?token={reset_token}&type={user_type}"
-    
-    subject = "BioTeK - Password Reset Request"
+# Background senders for request handlers; each worker thread keeps its own
+# pooled SMTP connection
+_EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="email")
+
+
+def send_email_async(to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> Future:
+    """Queue an email for a background thread; the Future resolves to send_email()'s result"""
+    return _EMAIL_EXECUTOR.submit(send_email, to_email, subject, body, html_body)
+
+
+def send_many(messages: List[Tuple[str, str, str, Optional[str]]]) -> List[bool]:
+    """
+    Send several (to_email, subject, body, html_body) emails over one connection
+    Returns a success flag per message
+    """
+    if not EMAIL_ENABLED:
+        return [send_email(*message) for message in messages]
     
-    body = f"""
+    server = None
+    results = []
+    for to_email, subject, body, html_body in messages:
+        msg = _build_message(to_email, subject, body, html_body)
+        try:
+            if server is None:
+                server = _smtp_session()
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Server hung up mid-batch; carry on over a fresh connection
+                _drop_smtp_connection()
+                server = _smtp_local.server = _smtp_connect()
+                server.send_message(msg)
+            results.append(True)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+            # The server rejected this message; the connection is still usable
+            print(f"❌ Email send failed: {e}")
+            results.append(False)
+        except Exception as e:
+            _drop_smtp_connection()
+            server = None
+            print(f"❌ Email send failed: {e}")
+            results.append(False)
+    return results
+
+
+# Message templates ($name placeholders), built once and filled in with substitute()
+_RESET_TEXT = Template("""
 Dear User,
 
 You have requested to reset your password for your BioTeK account.
 
 Click the link below to reset your password:
-{reset_url}
+${reset_url}
 
 This link will expire in 1 hour.
 
@@ -90,24 +183,24 @@ BioTeK Security Team
 
 ---
 This is an automated email. Please do not reply.
-    """.strip()
-    
-    html_body = f"""
+    """.strip())
+
+_RESET_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                       color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .button {{ display: inline-block; background: #667eea; color: white; 
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                       color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+            .button { display: inline-block; background: #667eea; color: white; 
                       padding: 15px 30px; text-decoration: none; border-radius: 5px; 
-                      margin: 20px 0; font-weight: bold; }}
-            .warning {{ background: #fff3cd; border-left: 4px solid #ffc107; 
-                       padding: 15px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 12px; }}
+                      margin: 20px 0; font-weight: bold; }
+            .warning { background: #fff3cd; border-left: 4px solid #ffc107; 
+                       padding: 15px; margin: 20px 0; }
+            .footer { text-align: center; margin-top: 30px; color: #666; font-size: 12px; }
         </style>
     </head>
     <body>
@@ -120,11 +213,11 @@ This is an automated email. Please do not reply.
                 <p>You have requested to reset your password for your BioTeK account.</p>
                 <p>Click the button below to reset your password:</p>
                 <p style="text-align: center;">
-                    <a href="{reset_url}" class="button">Reset Password</a>
+                    <a href="${reset_url}" class="button">Reset Password</a>
                 </p>
                 <p style="color: #666; font-size: 12px;">
                     Or copy this link: <br>
-                    <code>{reset_url}</code>
+                    <code>${reset_url}</code>
                 </p>
                 <div class="warning">
                     <strong>⚠️ Security Notice:</strong>
@@ -142,29 +235,35 @@ This is an automated email. Please do not reply.
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(to_email, subject, body, html_body)
+    """)
 
 
-def send_account_activation_email(to_email: str, user_id: str, temporary_password: str, role: str) -> bool:
-    """Send account activation email to new staff member"""
+def send_password_reset_email(to_email: str, reset_token: str, user_type: str,
+        background: bool = False) -> Union[bool, Future]:
+    """Send password reset email (background=True queues it and returns a Future)"""
     
-    login_url = f"{FRONTEND_URL}/login"
+    reset_url = f"{FRONTEND_URL}/reset-password?token={reset_token}&type={user_type}"
     
-    subject = "Welcome to BioTeK - Your Account Has Been Created"
+    subject = "BioTeK - Password Reset Request"
+    
+    body = _RESET_TEXT.substitute(reset_url=reset_url)
+    html_body = _RESET_HTML.substitute(reset_url=reset_url)
     
-    body = f"""
+    send = send_email_async if background else send_email
+    return send(to_email, subject, body, html_body)
+
+
+_ACTIVATION_TEXT = Template("""
 Dear Healthcare Professional,
 
 Welcome to BioTeK! Your account has been created by the system administrator.
 
 Your Login Credentials:
-- User ID: {user_id}
-- Temporary Password: {temporary_password}
-- Role: {role.capitalize()}
+- User ID: ${user_id}
+- Temporary Password: ${temporary_password}
+- Role: ${role}
 
-Login at: {login_url}
+Login at: ${login_url}
 
 IMPORTANT: Please change your password after your first login.
 
@@ -181,26 +280,26 @@ BioTeK Administration Team
 
 ---
 This is an automated email. Please do not reply.
-    """.strip()
-    
-    html_body = f"""
+    """.strip())
+
+_ACTIVATION_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); 
-                       color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .credentials {{ background: white; border: 2px solid #11998e; padding: 20px; 
-                           border-radius: 5px; margin: 20px 0; }}
-            .button {{ display: inline-block; background: #11998e; color: white; 
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); 
+                       color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+            .credentials { background: white; border: 2px solid #11998e; padding: 20px; 
+                           border-radius: 5px; margin: 20px 0; }
+            .button { display: inline-block; background: #11998e; color: white; 
                       padding: 15px 30px; text-decoration: none; border-radius: 5px; 
-                      margin: 20px 0; font-weight: bold; }}
-            .security {{ background: #e7f5ff; border-left: 4px solid #0066cc; 
-                        padding: 15px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 12px; }}
+                      margin: 20px 0; font-weight: bold; }
+            .security { background: #e7f5ff; border-left: 4px solid #0066cc; 
+                        padding: 15px; margin: 20px 0; }
+            .footer { text-align: center; margin-top: 30px; color: #666; font-size: 12px; }
         </style>
     </head>
     <body>
@@ -215,13 +314,13 @@ This is an automated email. Please do not reply.
                 
                 <div class="credentials">
                     <h3>🔐 Your Login Credentials</h3>
-                    <p><strong>User ID:</strong> <code>{user_id}</code></p>
-                    <p><strong>Temporary Password:</strong> <code>{temporary_password}</code></p>
-                    <p><strong>Role:</strong> {role.capitalize()}</p>
+                    <p><strong>User ID:</strong> <code>${user_id}</code></p>
+                    <p><strong>Temporary Password:</strong> <code>${temporary_password}</code></p>
+                    <p><strong>Role:</strong> ${role}</p>
                 </div>
                 
                 <p style="text-align: center;">
-                    <a href="{login_url}" class="button">Login to BioTeK</a>
+                    <a href="${login_url}" class="button">Login to BioTeK</a>
                 </p>
                 
                 <div class="security">
@@ -244,24 +343,34 @@ This is an automated email. Please do not reply.
         </div>
     </body>
     </html>
-    """
-    
-    return send_email(to_email, subject, body, html_body)
+    """)
 
 
-def send_security_alert_email(to_email: str, alert_type: str, details: str) -> bool:
-    """Send security alert email"""
+def send_account_activation_email(to_email: str, user_id: str, temporary_password: str, role: str,
+        background: bool = False) -> Union[bool, Future]:
+    """Send account activation email to new staff member (background=True queues it and returns a Future)"""
     
-    subject = f"BioTeK Security Alert - {alert_type}"
+    login_url = f"{FRONTEND_URL}/login"
+    
+    subject = "Welcome to BioTeK - Your Account Has Been Created"
+    
+    fields = dict(user_id=user_id, temporary_password=temporary_password,
+                  role=role.capitalize(), login_url=login_url)
+    body = _ACTIVATION_TEXT.substitute(fields)
+    html_body = _ACTIVATION_HTML.substitute(fields)
     
-    body = f"""
+    send = send_email_async if background else send_email
+    return send(to_email, subject, body, html_body)
+
+
+_SECURITY_ALERT_TEXT = Template("""
 SECURITY ALERT
 
-Alert Type: {alert_type}
-Time: {datetime.now().isoformat()}
+Alert Type: ${alert_type}
+Time: ${timestamp}
 
 Details:
-{details}
+${details}
 
 If this was not you, please contact the system administrator immediately
 and change your password.
@@ -271,20 +380,20 @@ BioTeK Security Team
 
 ---
 This is an automated security alert. Please do not reply.
-    """.strip()
-    
-    html_body = f"""
+    """.strip())
+
+_SECURITY_ALERT_HTML = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
-                       color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-            .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-            .alert {{ background: #fee; border-left: 4px solid #d00; padding: 20px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 12px; }}
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .header { background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
+                       color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+            .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+            .alert { background: #fee; border-left: 4px solid #d00; padding: 20px; margin: 20px 0; }
+            .footer { text-align: center; margin-top: 30px; color: #666; font-size: 12px; }
         </style>
     </head>
     <body>
@@ -294,10 +403,10 @@ This is an automated security alert. Please do not reply.
             </div>
             <div class="content">
                 <div class="alert">
-                    <h3>Alert Type: {alert_type}</h3>
-                    <p><strong>Time:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                    <h3>Alert Type: ${alert_type}</h3>
+                    <p><strong>Time:</strong> ${time}</p>
                     <p><strong>Details:</strong></p>
-                    <p>{details}</p>
+                    <p>${details}</p>
                 </div>
                 <p><strong style="color: #d00;">If this was not you, take action immediately:</strong></p>
                 <ol>
@@ -313,6 +422,23 @@ This is an automated security alert. Please do not reply.
         </div>
     </body>
     </html>
+    """)
+
+
+def send_security_alert_email(to_email: str, alert_type: str, details: str,
+        background: bool = False, event_time: Optional[datetime] = None) -> Union[bool, Future]:
+    """
+    Send security alert email (background=True queues it and returns a Future)
+    Pass the same event_time when alerting several users about one event
     """
     
-    return send_email(to_email, subject, body, html_body)
+    subject = f"BioTeK Security Alert - {alert_type}"
+    
+    event_time = event_time or datetime.now(timezone.utc)
+    body = _SECURITY_ALERT_TEXT.substitute(
+        alert_type=alert_type, details=details, timestamp=event_time.isoformat())
+    html_body = _SECURITY_ALERT_HTML.substitute(
+        alert_type=alert_type, details=details, time=event_time.strftime('%Y-%m-%d %H:%M:%S'))
+    
+    send = send_email_async if background else send_email
+    return send(to_email, subject, body, html_body)
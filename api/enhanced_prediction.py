@@ -5,19 +5,149 @@ Integrates: ML Models + Evo 2 (DNA) + GLM-4.5V (Medical Imaging) + Local LLM
 This is the unified prediction system that combines all AI capabilities.
 """
 
+import io
 import os
-from typing import Dict, List, Any, Optional
+import re
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Mapping
 from dataclasses import dataclass, field
-from datetime import datetime
+from functools import lru_cache
+from datetime import datetime, timezone
 from pathlib import Path
 import json
 import base64
 
+import numpy as np
 from dotenv import load_dotenv
 load_dotenv()
 
 from api.cloud_models import BioTekCloudClient, CloudModelConfig
 
+# Maximum in-flight Evo 2 requests per analysis (NIM rate limits)
+EVO2_MAX_CONCURRENCY = int(os.getenv("EVO2_MAX_CONCURRENCY", "4"))
+
+# Abnormality keywords, matched anywhere in the text (so "masses" and
+# "abnormalities" count) in a single case-insensitive pass
+_ABNORMALITY_RE = re.compile(r"abnormal|lesion|mass|opacity|nodule|tumor", re.IGNORECASE)
+
+
+# Default clinical question per (image type, body region)
+_IMAGING_QUESTIONS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "xray": MappingProxyType({
+        "chest": "Evaluate for pneumonia, cardiomegaly, pleural effusion, masses, and other thoracic abnormalities.",
+        "abdomen": "Evaluate for bowel obstruction, free air, calcifications, and other abdominal pathology.",
+        "spine": "Evaluate for fractures, degenerative changes, alignment, and disc space abnormalities.",
+        "extremity": "Evaluate for fractures, dislocations, joint abnormalities, and soft tissue swelling."
+    }),
+    "ct": MappingProxyType({
+        "chest": "Evaluate for pulmonary nodules, masses, lymphadenopathy, and mediastinal abnormalities.",
+        "abdomen": "Evaluate for hepatic lesions, pancreatic abnormalities, and abdominal masses.",
+        "brain": "Evaluate for hemorrhage, infarct, masses, and structural abnormalities."
+    }),
+    "mri": MappingProxyType({
+        "brain": "Evaluate for white matter changes, masses, and neurodegenerative findings.",
+        "spine": "Evaluate for disc herniation, spinal stenosis, and cord signal abnormalities.",
+        "cardiac": "Evaluate for cardiomyopathy, wall motion abnormalities, and structural defects."
+    })
+})
+_NO_QUESTIONS: Mapping[str, str] = MappingProxyType({})
+_DEFAULT_IMAGING_QUESTION = "Provide comprehensive analysis of this medical image."
+
+
+@lru_cache(maxsize=256)
+def _imaging_question(image_type: str, body_region: str, clinical_context: Optional[str]) -> str:
+    """Clinical question for an image; memoized since batches repeat type/region"""
+    base_question = _IMAGING_QUESTIONS.get(image_type, _NO_QUESTIONS).get(
+        body_region, _DEFAULT_IMAGING_QUESTION)
+    
+    if clinical_context:
+        return f"{base_question} Clinical context: {clinical_context}"
+    
+    return base_question
+
+
+# Raw DNA sequences are analyzed in RAW_WINDOW bp windows that overlap by
+# RAW_WINDOW - RAW_STRIDE bp, at most RAW_MAX_WINDOWS per request
+RAW_WINDOW = 1000
+RAW_STRIDE = 900
+RAW_MAX_WINDOWS = int(os.getenv("EVO2_RAW_MAX_WINDOWS", "20"))
+
+
+def _sequence_windows(sequence: str) -> List[tuple]:
+    """(start, end) offsets of the overlapping windows covering a sequence"""
+    if len(sequence) <= RAW_WINDOW:
+        return [(0, len(sequence))]
+    last_start = max(len(sequence) - RAW_WINDOW, 0)
+    starts = list(range(0, last_start, RAW_STRIDE)) + [last_start]
+    return [(start, start + RAW_WINDOW) for start in starts[:RAW_MAX_WINDOWS]]
+
+
+def _covered_length(windows: List[tuple]) -> int:
+    """Number of bases covered by a sorted list of (start, end) windows"""
+    covered, reach = 0, 0
+    for start, end in windows:
+        covered += max(end - max(start, reach), 0)
+        reach = max(reach, end)
+    return covered
+
+
+# Clinical report section rule and fixed disclaimer text
+_REPORT_RULE = "=" * 60 + "\n"
+_REPORT_DISCLAIMER = (
+    "This AI-generated assessment is for clinical decision support only.\n"
+    "It is not a medical diagnosis. All findings should be reviewed by\n"
+    "a qualified healthcare professional.\n"
+    "\n"
+)
+
+
+class _ResultCache:
+    """Thread-safe LRU of successful API results"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# Evo 2 results keyed by (model, SHA-256 of the sequence); variant contexts
+# repeat heavily, so most sequences of a request are already known
+_EVO2_CACHE = _ResultCache(maxsize=4096)
+
+# Maximum in-flight GLM-4.5V requests per imaging analysis (OpenRouter limits)
+VISION_MAX_CONCURRENCY = int(os.getenv("VISION_MAX_CONCURRENCY", "4"))
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion from synchronous code"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop (e.g. an async endpoint): use a fresh loop on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 
 # =============================================================================
 # DATA MODELS
@@ -84,18 +214,39 @@ class EnhancedPredictionEngine:
     - Local LLM (clinical reports)
     """
     
+    # Provider status shared by all engines: (expires_at, status)
+    STATUS_TTL = 60.0
+    _status_cache: Optional[tuple] = None
+    
     def __init__(self):
         self.cloud_client = BioTekCloudClient()
         self._check_configuration()
     
+    def close(self) -> None:
+        """Release pooled cloud HTTP connections"""
+        self.cloud_client.close()
+    
+    def __enter__(self) -> "EnhancedPredictionEngine":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
     def _check_configuration(self) -> Dict[str, bool]:
-        """Check which models are available"""
+        """Check which models are available (cached for STATUS_TTL seconds)"""
+        cached = EnhancedPredictionEngine._status_cache
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return dict(cached[1])
+        
         status = self.cloud_client.check_api_status()
-        return {
+        configuration = {
             "evo2_available": status["nvidia_nim"]["configured"],
             "glm45v_available": status["openrouter"]["configured"],
             "ml_models_available": True  # Assuming local ML models are always available
         }
+        EnhancedPredictionEngine._status_cache = (now + self.STATUS_TTL, configuration)
+        return dict(configuration)
     
     # =========================================================================
     # EVO 2 - GENETIC ANALYSIS
@@ -105,6 +256,14 @@ class EnhancedPredictionEngine:
         self, 
         variants: List[Dict[str, Any]],
         raw_sequence: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Analyze genetic variants using Evo 2 (see analyze_genetic_variants_async)"""
+        return _run_sync(self.analyze_genetic_variants_async(variants, raw_sequence))
+    
+    async def analyze_genetic_variants_async(
+        self, 
+        variants: List[Dict[str, Any]],
+        raw_sequence: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Analyze genetic variants using Evo 2
@@ -132,63 +291,23 @@ class EnhancedPredictionEngine:
         }
         
         try:
-            # Analyze each variant
-            for variant in variants[:10]:  # Limit to 10 for API rate limits
-                # Build sequence context around variant
-                # In real implementation, would fetch reference genome
-                ref_allele = variant.get("ref", "A")
-                alt_allele = variant.get("alt", "G")
-                
-                # Create minimal sequence context
-                context_before = "ATCGATCGATCG"  # Placeholder - would be real genome
-                context_after = "GCTAGCTAGCTA"
-                
-                ref_seq = context_before + ref_allele + context_after
-                alt_seq = context_before + alt_allele + context_after
-                
-                # Analyze with Evo 2
-                try:
-                    ref_analysis = self.cloud_client.evo2.analyze_sequence(ref_seq)
-                    alt_analysis = self.cloud_client.evo2.analyze_sequence(alt_seq)
-                    
-                    # Simple effect score based on embedding difference
-                    effect_entry = {
-                        "rsid": variant.get("rsid", "unknown"),
-                        "chromosome": variant.get("chromosome"),
-                        "position": variant.get("position"),
-                        "ref": ref_allele,
-                        "alt": alt_allele,
-                        "analyzed": True,
-                        "evo2_processed": True
-                    }
-                    
-                    results["variant_effects"].append(effect_entry)
-                    
-                except Exception as e:
-                    results["variant_effects"].append({
-                        "rsid": variant.get("rsid", "unknown"),
-                        "analyzed": False,
-                        "error": str(e)
-                    })
+            # Each variant's ref/alt (and the raw sequence) run concurrently
+            outcomes = await self._analyze_variants_async(variants, raw_sequence)
             
-            # If raw sequence provided, analyze it directly
-            if raw_sequence and len(raw_sequence) >= 20:
-                try:
-                    seq_analysis = self.cloud_client.evo2.analyze_sequence(
-                        raw_sequence[:1000]  # Limit sequence length
-                    )
-                    results["sequence_analysis"] = {
-                        "length": len(raw_sequence),
-                        "analyzed_length": min(len(raw_sequence), 1000),
-                        "evo2_embedding": True
-                    }
-                except Exception as e:
-                    results["sequence_analysis"] = {"error": str(e)}
+            effects_append = results["variant_effects"].append
+            analyzed_count = 0
+            for outcome in outcomes:
+                if "sequence_analysis" in outcome:
+                    results["sequence_analysis"] = outcome["sequence_analysis"]
+                else:
+                    effects_append(outcome)
+                    if outcome["analyzed"]:
+                        analyzed_count += 1
             
             # Generate summary
             results["summary"] = {
                 "total_variants": len(variants),
-                "successfully_analyzed": len([v for v in results["variant_effects"] if v.get("analyzed")]),
+                "successfully_analyzed": analyzed_count,
                 "model": "Evo 2 (Arc Institute)",
                 "note": "Variant effect predictions based on DNA language model embeddings"
             }
@@ -199,6 +318,98 @@ class EnhancedPredictionEngine:
         
         return results
     
+    async def _analyze_variants_async(
+        self,
+        variants: List[Dict[str, Any]],
+        raw_sequence: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Analyze all variants (and the raw sequence) with one batched Evo 2 call"""
+        all_seqs = []
+        idx_map = []  # (variant, ref_allele, alt_allele, index of ref_seq in all_seqs)
+        seqs_append = all_seqs.append
+        idx_append = idx_map.append
+        
+        # Create minimal sequence context
+        context_before = "ATCGATCGATCG"  # Placeholder - would be real genome
+        context_after = "GCTAGCTAGCTA"
+        
+        for variant in variants[:10]:  # Limit to 10 for API rate limits
+            # Build sequence context around variant
+            # In real implementation, would fetch reference genome
+            get = variant.get
+            ref_allele = get("ref", "A")
+            alt_allele = get("alt", "G")
+            
+            idx_append((variant, ref_allele, alt_allele, len(all_seqs)))
+            seqs_append(context_before + ref_allele + context_after)
+            seqs_append(context_before + alt_allele + context_after)
+        
+        # If raw sequence provided, analyze it directly, in overlapping
+        # windows so long sequences are covered end to end
+        windows = _sequence_windows(raw_sequence) if raw_sequence and len(raw_sequence) >= 20 else []
+        first_window = len(all_seqs)
+        all_seqs.extend(raw_sequence[start:end] for start, end in windows)
+        
+        # Analyze with Evo 2 (blocking client call on a worker thread)
+        analyses = await asyncio.to_thread(self._analyze_sequences_cached, all_seqs)
+        
+        outcomes = []
+        outcomes_append = outcomes.append
+        for variant, ref_allele, alt_allele, i in idx_map:
+            get = variant.get
+            ref_analysis, alt_analysis = analyses[i], analyses[i + 1]
+            error = next((a for a in (ref_analysis, alt_analysis) if isinstance(a, Exception)), None)
+            if error is not None:
+                outcomes_append({
+                    "rsid": get("rsid", "unknown"),
+                    "analyzed": False,
+                    "error": str(error)
+                })
+                continue
+            
+            # Simple effect score based on embedding difference
+            outcomes_append({
+                "rsid": get("rsid", "unknown"),
+                "chromosome": get("chromosome"),
+                "position": get("position"),
+                "ref": ref_allele,
+                "alt": alt_allele,
+                "analyzed": True,
+                "evo2_processed": True
+            })
+        
+        if windows:
+            window_results = analyses[first_window:]
+            covered = [w for w, r in zip(windows, window_results) if not isinstance(r, Exception)]
+            if not covered:
+                outcomes.append({"sequence_analysis": {"error": str(window_results[0])}})
+            else:
+                outcomes.append({"sequence_analysis": {
+                    "length": len(raw_sequence),
+                    "analyzed_length": _covered_length(covered),
+                    "windows": len(windows),
+                    "windows_analyzed": len(covered),
+                    "evo2_embedding": True
+                }})
+        
+        return outcomes
+    
+    def _analyze_sequences_cached(self, sequences: List[str]) -> List[Any]:
+        """analyze_sequences() for the sequences not already in _EVO2_CACHE (each unique one once)"""
+        evo2 = self.cloud_client.evo2
+        keys = [(evo2.model, hashlib.sha256(seq.encode()).digest()) for seq in sequences]
+        results = {key: _EVO2_CACHE.get(key) for key in keys}
+        
+        missing = {key: seq for key, seq in zip(keys, sequences) if results[key] is None}
+        if missing:
+            analyses = evo2.analyze_sequences(list(missing.values()), EVO2_MAX_CONCURRENCY)
+            for key, analysis in zip(missing, analyses):
+                results[key] = analysis
+                if not isinstance(analysis, Exception):
+                    _EVO2_CACHE.put(key, analysis)
+        
+        return [results[key] for key in keys]
+    
     # =========================================================================
     # GLM-4.5V - MEDICAL IMAGING ANALYSIS
     # =========================================================================
@@ -206,6 +417,13 @@ class EnhancedPredictionEngine:
     def analyze_medical_images(
         self,
         images: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Analyze medical images using GLM-4.5V (see analyze_medical_images_async)"""
+        return _run_sync(self.analyze_medical_images_async(images))
+    
+    async def analyze_medical_images_async(
+        self,
+        images: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """
         Analyze medical images using GLM-4.5V
@@ -233,60 +451,21 @@ class EnhancedPredictionEngine:
         }
         
         try:
-            for img_data in images:
-                image_path = img_data.get("path")
-                image_type = img_data.get("type", "xray")
-                body_region = img_data.get("body_region", "chest")
-                clinical_context = img_data.get("clinical_context")
-                
-                if not image_path or not Path(image_path).exists():
-                    results["findings"].append({
-                        "image": image_path,
-                        "status": "error",
-                        "error": "Image file not found"
-                    })
-                    continue
-                
-                # Build clinical question based on context
-                clinical_question = self._build_imaging_question(
-                    image_type, body_region, clinical_context
-                )
-                
-                # Analyze with GLM-4.5V
-                try:
-                    analysis = self.cloud_client.vision.analyze_medical_image(
-                        image_path=image_path,
-                        image_type=image_type,
-                        clinical_question=clinical_question,
-                        use_reasoning=True
-                    )
-                    
-                    finding = {
-                        "image": Path(image_path).name,
-                        "type": image_type,
-                        "body_region": body_region,
-                        "status": "analyzed",
-                        "analysis": analysis.get("analysis", ""),
-                        "reasoning_used": analysis.get("reasoning_used", False)
-                    }
-                    
-                    results["findings"].append(finding)
-                    results["images_analyzed"] += 1
-                    
-                    # Extract abnormalities from analysis text
-                    analysis_text = analysis.get("analysis", "").lower()
-                    if any(word in analysis_text for word in ["abnormal", "lesion", "mass", "opacity", "nodule", "tumor"]):
-                        results["abnormalities_detected"].append({
-                            "image": Path(image_path).name,
-                            "finding": "Potential abnormality detected - review recommended"
-                        })
-                    
-                except Exception as e:
-                    results["findings"].append({
-                        "image": Path(image_path).name,
-                        "status": "error",
-                        "error": str(e)
-                    })
+            # All images are analyzed concurrently; findings keep input order
+            findings = await self._analyze_images_async(images)
+            results["findings"] = findings
+            
+            analyzed = [f for f in findings if f["status"] == "analyzed"]
+            results["images_analyzed"] = len(analyzed)
+            
+            # Extract abnormalities from all analysis texts in one sweep
+            results["abnormalities_detected"] = [
+                {
+                    "image": f["image"],
+                    "finding": "Potential abnormality detected - review recommended"
+                }
+                for f in analyzed if _ABNORMALITY_RE.search(f["analysis"])
+            ]
             
             # Generate summary
             results["summary"] = {
@@ -309,6 +488,69 @@ class EnhancedPredictionEngine:
         
         return results
     
+    async def _analyze_images_async(self, images: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fan out GLM-4.5V calls, bounded by VISION_MAX_CONCURRENCY"""
+        semaphore = asyncio.Semaphore(VISION_MAX_CONCURRENCY)
+        return await asyncio.gather(
+            *(self._analyze_one_image_async(img_data, semaphore) for img_data in images)
+        )
+    
+    async def _analyze_one_image_async(
+        self,
+        img_data: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Analyze one image; returns its finding"""
+        get = img_data.get
+        image_path = get("path")
+        image_type = get("type", "xray")
+        body_region = get("body_region", "chest")
+        clinical_context = get("clinical_context")
+        
+        not_found = {
+            "image": image_path,
+            "status": "error",
+            "error": "Image file not found"
+        }
+        if not image_path:
+            return not_found
+        image_name = Path(image_path).name
+        
+        # Build clinical question based on context
+        clinical_question = self._build_imaging_question(
+            image_type, body_region, clinical_context
+        )
+        
+        # Analyze with GLM-4.5V (blocking client call on a worker thread)
+        try:
+            async with semaphore:
+                analysis = await asyncio.to_thread(
+                    self.cloud_client.vision.analyze_medical_image,
+                    image_path=image_path,
+                    image_type=image_type,
+                    clinical_question=clinical_question,
+                    use_reasoning=True
+                )
+            
+            return {
+                "image": image_name,
+                "type": image_type,
+                "body_region": body_region,
+                "status": "analyzed",
+                "analysis": analysis.get("analysis", ""),
+                "reasoning_used": analysis.get("reasoning_used", False)
+            }
+            
+        except FileNotFoundError:
+            # The client opens the image itself, so no separate exists() check
+            return not_found
+        except Exception as e:
+            return {
+                "image": image_name,
+                "status": "error",
+                "error": str(e)
+            }
+    
     def _build_imaging_question(
         self, 
         image_type: str, 
@@ -316,33 +558,7 @@ class EnhancedPredictionEngine:
         clinical_context: Optional[str]
     ) -> str:
         """Build appropriate clinical question for imaging analysis"""
-        
-        questions = {
-            "xray": {
-                "chest": "Evaluate for pneumonia, cardiomegaly, pleural effusion, masses, and other thoracic abnormalities.",
-                "abdomen": "Evaluate for bowel obstruction, free air, calcifications, and other abdominal pathology.",
-                "spine": "Evaluate for fractures, degenerative changes, alignment, and disc space abnormalities.",
-                "extremity": "Evaluate for fractures, dislocations, joint abnormalities, and soft tissue swelling."
-            },
-            "ct": {
-                "chest": "Evaluate for pulmonary nodules, masses, lymphadenopathy, and mediastinal abnormalities.",
-                "abdomen": "Evaluate for hepatic lesions, pancreatic abnormalities, and abdominal masses.",
-                "brain": "Evaluate for hemorrhage, infarct, masses, and structural abnormalities."
-            },
-            "mri": {
-                "brain": "Evaluate for white matter changes, masses, and neurodegenerative findings.",
-                "spine": "Evaluate for disc herniation, spinal stenosis, and cord signal abnormalities.",
-                "cardiac": "Evaluate for cardiomyopathy, wall motion abnormalities, and structural defects."
-            }
-        }
-        
-        base_question = questions.get(image_type, {}).get(body_region, 
-            "Provide comprehensive analysis of this medical image.")
-        
-        if clinical_context:
-            return f"{base_question} Clinical context: {clinical_context}"
-        
-        return base_question
+        return _imaging_question(image_type, body_region, clinical_context)
     
     # =========================================================================
     # COMBINED PREDICTION
@@ -354,10 +570,24 @@ class EnhancedPredictionEngine:
         include_genetic: bool = True,
         include_imaging: bool = True,
         generate_report: bool = True
+    ) -> PredictionResult:
+        """Run complete enhanced prediction pipeline (see predict_async)"""
+        return _run_sync(self.predict_async(
+            patient, include_genetic, include_imaging, generate_report
+        ))
+    
+    async def predict_async(
+        self,
+        patient: PatientData,
+        include_genetic: bool = True,
+        include_imaging: bool = True,
+        generate_report: bool = True
     ) -> PredictionResult:
         """
         Run complete enhanced prediction pipeline
         
+        The ML, genetic and imaging stages are independent and run concurrently.
+        
         Args:
             patient: Complete patient data
             include_genetic: Whether to run Evo 2 genetic analysis
@@ -367,32 +597,43 @@ class EnhancedPredictionEngine:
         Returns:
             Complete prediction result from all models
         """
-        import time
-        start_time = time.time()
+        start = time.perf_counter_ns()
         
         result = PredictionResult(
             patient_id=patient.patient_id,
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now(timezone.utc).isoformat()
         )
         
-        # 1. Core ML Prediction (existing disease risk models)
-        result.ml_prediction = self._run_ml_prediction(patient)
+        run_genetic = include_genetic and (patient.genetic_variants or patient.raw_dna_sequence)
+        run_imaging = include_imaging and patient.medical_images
+        
+        async with asyncio.TaskGroup() as tg:
+            # 1. Core ML Prediction (existing disease risk models, local CPU)
+            ml_task = tg.create_task(asyncio.to_thread(self._run_ml_prediction, patient))
+            
+            # 2. Genetic Analysis with Evo 2
+            if run_genetic:
+                genetic_task = tg.create_task(self.analyze_genetic_variants_async(
+                    variants=patient.genetic_variants,
+                    raw_sequence=patient.raw_dna_sequence
+                ))
+            
+            # 3. Medical Imaging with GLM-4.5V
+            if run_imaging:
+                imaging_task = tg.create_task(self.analyze_medical_images_async(
+                    images=patient.medical_images
+                ))
+        
+        result.ml_prediction = ml_task.result()
         result.models_used.append("BioTeK ML Ensemble")
         
-        # 2. Genetic Analysis with Evo 2
-        if include_genetic and (patient.genetic_variants or patient.raw_dna_sequence):
-            result.genetic_analysis = self.analyze_genetic_variants(
-                variants=patient.genetic_variants,
-                raw_sequence=patient.raw_dna_sequence
-            )
+        if run_genetic:
+            result.genetic_analysis = genetic_task.result()
             if result.genetic_analysis.get("status") == "completed":
                 result.models_used.append("Evo 2 (NVIDIA NIM)")
         
-        # 3. Medical Imaging with GLM-4.5V
-        if include_imaging and patient.medical_images:
-            result.imaging_analysis = self.analyze_medical_images(
-                images=patient.medical_images
-            )
+        if run_imaging:
+            result.imaging_analysis = imaging_task.result()
             if result.imaging_analysis.get("status") == "completed":
                 result.models_used.append("GLM-4.5V (OpenRouter)")
         
@@ -404,7 +645,7 @@ class EnhancedPredictionEngine:
             result.clinical_report = self._generate_clinical_report(patient, result)
         
         # Calculate processing time
-        result.processing_time_ms = (time.time() - start_time) * 1000
+        result.processing_time_ms = (time.perf_counter_ns() - start) / 1e6
         
         return result
     
@@ -434,13 +675,21 @@ class EnhancedPredictionEngine:
         risk_signals = 0
         total_signals = 0
         
-        # Analyze ML predictions
+        # Analyze ML predictions (one vectorized comparison over all diseases)
         if result.ml_prediction.get("status") == "completed":
-            for disease, data in result.ml_prediction.get("diseases", {}).items():
-                if data.get("risk", 0) > 0.5:
-                    risk_signals += 1
-                    combined["risk_factors"].append(f"Elevated {disease} risk from biomarkers")
-                total_signals += 1
+            diseases = result.ml_prediction.get("diseases", {})
+            risks = np.fromiter(
+                (data.get("risk", 0) for data in diseases.values()),
+                dtype=np.float64, count=len(diseases)
+            )
+            elevated = np.flatnonzero(risks > 0.5)
+            if elevated.size:
+                names = list(diseases)
+                combined["risk_factors"].extend(
+                    f"Elevated {names[i]} risk from biomarkers" for i in elevated
+                )
+            risk_signals += int(elevated.size)
+            total_signals += int(risks.size)
         
         # Analyze genetic findings
         if result.genetic_analysis.get("status") == "completed":
@@ -479,103 +728,92 @@ class EnhancedPredictionEngine:
     ) -> str:
         """Generate clinical report summarizing all findings"""
         
-        report_parts = [
-            "=" * 60,
-            "BIOTEK ENHANCED CLINICAL RISK ASSESSMENT",
-            "=" * 60,
-            f"Patient ID: {patient.patient_id}",
-            f"Age: {patient.age} | Sex: {patient.sex}",
-            f"Assessment Date: {result.timestamp}",
-            f"Models Used: {', '.join(result.models_used)}",
-            "",
-            "=" * 60,
-            "SUMMARY",
-            "=" * 60,
-            f"Overall Risk Level: {result.combined_risk.get('overall_risk_level', 'N/A').upper()}",
-            f"Confidence: {result.combined_risk.get('confidence', 0):.1%}",
-            ""
-        ]
+        buf = io.StringIO()
+        
+        def line(text: str = "") -> None:
+            buf.write(text)
+            buf.write("\n")
+        
+        def heading(title: str) -> None:
+            buf.write(_REPORT_RULE)
+            line(title)
+            buf.write(_REPORT_RULE)
+        
+        heading("BIOTEK ENHANCED CLINICAL RISK ASSESSMENT")
+        line(f"Patient ID: {patient.patient_id}")
+        line(f"Age: {patient.age} | Sex: {patient.sex}")
+        line(f"Assessment Date: {result.timestamp}")
+        line(f"Models Used: {', '.join(result.models_used)}")
+        line()
+        heading("SUMMARY")
+        line(f"Overall Risk Level: {result.combined_risk.get('overall_risk_level', 'N/A').upper()}")
+        line(f"Confidence: {result.combined_risk.get('confidence', 0):.1%}")
+        line()
         
         # Risk factors
         risk_factors = result.combined_risk.get("risk_factors", [])
         if risk_factors:
-            report_parts.append("RISK FACTORS IDENTIFIED:")
+            line("RISK FACTORS IDENTIFIED:")
             for factor in risk_factors:
-                report_parts.append(f"  • {factor}")
-            report_parts.append("")
+                line(f"  • {factor}")
+            line()
         
         # Genetic analysis summary
         if result.genetic_analysis.get("status") == "completed":
-            report_parts.extend([
-                "=" * 60,
-                "GENETIC ANALYSIS (Evo 2)",
-                "=" * 60,
-                f"Variants Analyzed: {result.genetic_analysis.get('variants_analyzed', 0)}",
-            ])
+            heading("GENETIC ANALYSIS (Evo 2)")
+            line(f"Variants Analyzed: {result.genetic_analysis.get('variants_analyzed', 0)}")
             summary = result.genetic_analysis.get("summary", {})
             if summary:
-                report_parts.append(f"Successfully Processed: {summary.get('successfully_analyzed', 0)}")
-            report_parts.append("")
+                line(f"Successfully Processed: {summary.get('successfully_analyzed', 0)}")
+            line()
         
         # Imaging analysis summary
         if result.imaging_analysis.get("status") == "completed":
-            report_parts.extend([
-                "=" * 60,
-                "IMAGING ANALYSIS (GLM-4.5V)",
-                "=" * 60,
-                f"Images Analyzed: {result.imaging_analysis.get('images_analyzed', 0)}",
-                f"Abnormalities Detected: {len(result.imaging_analysis.get('abnormalities_detected', []))}",
-            ])
+            heading("IMAGING ANALYSIS (GLM-4.5V)")
+            line(f"Images Analyzed: {result.imaging_analysis.get('images_analyzed', 0)}")
+            line(f"Abnormalities Detected: {len(result.imaging_analysis.get('abnormalities_detected', []))}")
             for finding in result.imaging_analysis.get("findings", [])[:3]:
                 if finding.get("status") == "analyzed":
-                    report_parts.append(f"\n[{finding.get('type', 'image').upper()}] {finding.get('body_region', '')}")
-                    analysis = finding.get("analysis", "")[:500]
-                    report_parts.append(analysis)
-            report_parts.append("")
+                    line(f"\n[{finding.get('type', 'image').upper()}] {finding.get('body_region', '')}")
+                    line(finding.get("analysis", "")[:500])
+            line()
         
         # Recommendations
-        report_parts.extend([
-            "=" * 60,
-            "RECOMMENDATIONS",
-            "=" * 60
-        ])
+        heading("RECOMMENDATIONS")
         
         all_recommendations = result.imaging_analysis.get("recommendations", [])
         if result.combined_risk.get("overall_risk_level") == "high":
             all_recommendations.append("Schedule follow-up with healthcare provider for comprehensive evaluation.")
         
         for rec in all_recommendations or ["Continue routine health monitoring."]:
-            report_parts.append(f"  • {rec}")
+            line(f"  • {rec}")
         
-        report_parts.extend([
-            "",
-            "=" * 60,
-            "DISCLAIMER",
-            "=" * 60,
-            "This AI-generated assessment is for clinical decision support only.",
-            "It is not a medical diagnosis. All findings should be reviewed by",
-            "a qualified healthcare professional.",
-            "",
-            f"Processing Time: {result.processing_time_ms:.0f}ms"
-        ])
+        line()
+        heading("DISCLAIMER")
+        buf.write(_REPORT_DISCLAIMER)
+        buf.write(f"Processing Time: {result.processing_time_ms:.0f}ms")
         
-        return "\n".join(report_parts)
+        return buf.getvalue()
 
 
 # =============================================================================
 # CONVENIENCE FUNCTIONS
 # =============================================================================
 
+@lru_cache(maxsize=1)
+def _get_engine() -> EnhancedPredictionEngine:
+    """Process-wide engine shared by the convenience functions"""
+    return EnhancedPredictionEngine()
+
+
 def quick_dna_analysis(dna_sequence: str) -> Dict[str, Any]:
     """Quick DNA sequence analysis with Evo 2"""
-    engine = EnhancedPredictionEngine()
-    return engine.cloud_client.evo2.analyze_sequence(dna_sequence)
+    return _get_engine().cloud_client.evo2.analyze_sequence(dna_sequence)
 
 
 def quick_image_analysis(image_path: str, image_type: str = "xray") -> Dict[str, Any]:
     """Quick medical image analysis with GLM-4.5V"""
-    engine = EnhancedPredictionEngine()
-    return engine.analyze_medical_images([{
+    return _get_engine().analyze_medical_images([{
         "path": image_path,
         "type": image_type
     }])
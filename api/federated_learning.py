@@ -5,13 +5,114 @@ Enables hospitals to train together WITHOUT sharing patient data
 Google-level privacy tech: Only model weights are shared, never raw data
 """
 
+import os
+import atexit
+import random
+import threading
+import multiprocessing
+import logging
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.exceptions import ConvergenceWarning
 from typing import Dict, List, Tuple, Any
-import copy
 import json
-from datetime import datetime
+from datetime import datetime, timezone
+
+logger = logging.getLogger("biotek.federated")
+
+# Numba is optional - FedAvg falls back to NumPy matrix products without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _fedavg_kernel(coef_stack, intercept_stack, counts, out_coef, out_intercept):
+        """Sample-weighted mean of each coef/intercept column in one fused pass"""
+        total = counts.sum()
+        for d in prange(coef_stack.shape[1]):
+            acc = 0.0
+            for k in range(coef_stack.shape[0]):
+                acc += coef_stack[k, d] * counts[k]
+            out_coef[d] = acc / total
+        for c in range(intercept_stack.shape[1]):
+            acc = 0.0
+            for k in range(intercept_stack.shape[0]):
+                acc += intercept_stack[k, c] * counts[k]
+            out_intercept[c] = acc / total
+
+# Weights are exchanged and averaged in single precision: half the bytes of
+# sklearn's float64 and plenty for logistic-regression coefficients
+WEIGHT_DTYPE = np.float32
+
+# Synthetic cohort: normal columns (age, bmi, hba1c, ldl, prs), Bernoulli
+# rates (smoking, sex), and the risk weights over the first six features
+_NORMAL_COLUMNS = [0, 1, 2, 3, 5]
+_NORMAL_MEAN = np.array([50, 27, 6.5, 130, 0])
+_NORMAL_STD = np.array([15, 5, 1.5, 30, 1])
+_RISK_WEIGHTS = np.array([0.02, 0.05, 0.15, 0.01, 0.3, 0.2])
+
+# lbfgs iteration budget when a round starts from the global model. Hitting
+# it is expected (the next round continues from the aggregate), so the
+# resulting ConvergenceWarning is silenced for warm-started fits only
+WARM_START_MAX_ITER = 30
+
+# Worker processes for parallel_training, created on first multi-hospital round.
+# Spawned rather than forked (the caller may be a multithreaded server) and
+# bounded, since each worker holds its own copy of numpy/sklearn
+TRAINING_WORKERS = int(os.getenv("FEDERATED_TRAINING_WORKERS", str(min(4, os.cpu_count() or 1))))
+_TRAINING_POOL = None
+_TRAINING_POOL_LOCK = threading.Lock()
+
+
+def _training_pool() -> ProcessPoolExecutor:
+    global _TRAINING_POOL
+    with _TRAINING_POOL_LOCK:
+        if _TRAINING_POOL is None:
+            _TRAINING_POOL = ProcessPoolExecutor(
+                max_workers=TRAINING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_TRAINING_POOL.shutdown)
+    return _TRAINING_POOL
+
+
+def _fit_local_model(X: np.ndarray, y: np.ndarray, global_weights: Dict = None) -> Tuple[LogisticRegression, float]:
+    """
+    Fit one hospital's model; a plain function of arrays so it can run in a
+    worker process without pickling the Hospital
+    """
+    # Use logistic regression for federated learning (easier to aggregate).
+    # With global weights, warm_start makes lbfgs start from them (otherwise
+    # the assigned coef_ is ignored), so far fewer iterations are needed
+    warm = bool(global_weights)
+    model = LogisticRegression(
+        max_iter=WARM_START_MAX_ITER if warm else 100,
+        warm_start=warm,
+        random_state=42
+    )
+    
+    # If global weights provided, initialize with them
+    if warm:
+        model.coef_ = global_weights['coef']
+        model.intercept_ = global_weights['intercept']
+        model.classes_ = global_weights['classes']
+    
+    # Train on LOCAL data only
+    if warm:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            model.fit(X, y)
+    else:
+        model.fit(X, y)
+    
+    # Evaluate on local data
+    return model, model.score(X, y)
 
 class Hospital:
     """Represents a single hospital node in federated network"""
@@ -29,36 +130,22 @@ class Hospital:
         Generate synthetic patient data for this hospital
         In production: Use real local patient database
         """
-        if seed:
-            np.random.seed(seed)
-        
+        rng = np.random.default_rng(seed)
         n = self.num_patients
         
         # Features: age, bmi, hba1c, ldl, smoking, prs, sex
-        X = np.column_stack([
-            np.random.normal(50, 15, n),      # age
-            np.random.normal(27, 5, n),       # bmi
-            np.random.normal(6.5, 1.5, n),    # hba1c
-            np.random.normal(130, 30, n),     # ldl
-            np.random.binomial(1, 0.3, n),    # smoking
-            np.random.normal(0, 1, n),        # prs
-            np.random.binomial(1, 0.5, n)     # sex
-        ])
+        X = np.empty((n, 7))
+        X[:, _NORMAL_COLUMNS] = rng.normal(_NORMAL_MEAN, _NORMAL_STD, size=(n, 5))
+        X[:, 4] = rng.random(n) < 0.3     # smoking
+        X[:, 6] = rng.random(n) < 0.5     # sex
         
         # Generate labels (chronic disease risk)
-        # Risk increases with age, bmi, hba1c, smoking, prs
-        risk_score = (
-            0.02 * X[:, 0] +      # age
-            0.05 * X[:, 1] +      # bmi
-            0.15 * X[:, 2] +      # hba1c (strongest)
-            0.01 * X[:, 3] +      # ldl
-            0.3 * X[:, 4] +       # smoking
-            0.2 * X[:, 5]         # prs (genetic)
-        )
+        # Risk increases with age, bmi, hba1c (strongest), smoking, prs
+        risk_score = X[:, :6] @ _RISK_WEIGHTS
         
         # Convert to probability
-        prob = 1 / (1 + np.exp(-risk_score + 5))
-        y = np.random.binomial(1, prob)
+        prob = 1 / (1 + np.exp(5 - risk_score))
+        y = (rng.random(n) < prob).astype(int)
         
         self.local_data = (X, y)
         return X, y
@@ -71,59 +158,162 @@ class Hospital:
         if self.local_data is None:
             raise ValueError("No local data available")
         
-        X, y = self.local_data
-        
-        # Use logistic regression for federated learning (easier to aggregate)
-        model = LogisticRegression(max_iter=100, random_state=42)
-        
-        # If global weights provided, initialize with them
-        if global_weights:
-            model.coef_ = global_weights['coef']
-            model.intercept_ = global_weights['intercept']
-            model.classes_ = global_weights['classes']
-        
-        # Train on LOCAL data only
-        model.fit(X, y)
-        
+        model, accuracy = _fit_local_model(*self.local_data, global_weights)
+        self.record_local_model(model, accuracy)
+        return model, accuracy
+    
+    def record_local_model(self, model: LogisticRegression, accuracy: float):
+        """Keep a locally trained model and log it in the training history"""
         self.local_model = model
-        
-        # Evaluate on local data
-        accuracy = model.score(X, y)
-        
         self.history.append({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'accuracy': accuracy,
-            'num_samples': len(y)
+            'num_samples': len(self.local_data[1])
         })
-        
-        return model, accuracy
     
-    def get_model_weights(self) -> Dict:
+    def get_model_weights(self, global_weights: Dict = None, sparsity: float = 0.5) -> Dict:
         """
         Extract model weights to share
         ONLY weights are shared, NOT data
+        
+        With global_weights, only the compressed update (top-k int8 delta from
+        the global model, see compress_delta) is shared instead of full weights.
         """
         if self.local_model is None:
             raise ValueError("No trained model")
         
+        if global_weights is not None:
+            return {
+                'coef_delta': compress_delta(
+                    self.local_model.coef_ - global_weights['coef'], sparsity),
+                'intercept_delta': compress_delta(
+                    self.local_model.intercept_ - global_weights['intercept'], sparsity),
+                'classes': self.local_model.classes_.copy(),
+                'num_samples': self.num_patients
+            }
+        
         return {
-            'coef': copy.deepcopy(self.local_model.coef_),
-            'intercept': copy.deepcopy(self.local_model.intercept_),
-            'classes': copy.deepcopy(self.local_model.classes_),
+            'coef': self.local_model.coef_.astype(WEIGHT_DTYPE),
+            'intercept': self.local_model.intercept_.astype(WEIGHT_DTYPE),
+            'classes': self.local_model.classes_.copy(),
             'num_samples': self.num_patients
         }
 
 
+def compress_delta(delta: np.ndarray, sparsity: float = 0.5) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Compress a weight update for transmission
+    
+    Keeps the largest-magnitude (1 - sparsity) fraction of entries (at least
+    one) and quantizes them to int8 with a single per-tensor scale.
+    
+    Returns:
+        (flat indices, int8 values, scale)
+    """
+    flat = delta.ravel()
+    k = max(1, int(np.ceil(flat.size * (1 - sparsity))))
+    indices = np.argpartition(np.abs(flat), flat.size - k)[flat.size - k:].astype(np.int32)
+    kept = flat[indices]
+    
+    peak = float(np.abs(kept).max())
+    scale = peak / 127 if peak > 0 else 1.0
+    values = np.round(kept / scale).astype(np.int8)
+    return indices, values, scale
+
+
+def decompress_delta(compressed: Tuple[np.ndarray, np.ndarray, float], shape: Tuple[int, ...]) -> np.ndarray:
+    """Dense update from compress_delta() output; dropped entries are zero"""
+    indices, values, scale = compressed
+    dense = np.zeros(int(np.prod(shape)), dtype=WEIGHT_DTYPE)
+    dense[indices] = values.astype(WEIGHT_DTYPE) * scale
+    return dense.reshape(shape)
+
+
+def _encode_weight(value: Any, buffers: List[memoryview]) -> Any:
+    """JSON-safe header entry for one weights value; array data goes to buffers"""
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("object arrays cannot be serialized")
+        array = np.ascontiguousarray(value)
+        buffers.append(memoryview(array).cast('B'))
+        return {'array': len(buffers) - 1, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+    if isinstance(value, tuple):
+        return {'tuple': [_encode_weight(item, buffers) for item in value]}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _decode_weight(entry: Any, buffers: List) -> Any:
+    """Inverse of _encode_weight"""
+    if not isinstance(entry, dict):
+        return entry
+    if 'tuple' in entry:
+        return tuple(_decode_weight(item, buffers) for item in entry['tuple'])
+    dtype = np.dtype(entry['dtype'])
+    if dtype.hasobject:
+        raise ValueError("object arrays cannot be deserialized")
+    return np.frombuffer(buffers[entry['array']], dtype=dtype).reshape(entry['shape'])
+
+
+def serialize_weights(weights: Dict) -> Tuple[bytes, List[memoryview]]:
+    """
+    Serialize get_model_weights() output for transport to the coordinator
+    
+    Returns a small JSON header (keys, dtypes, shapes) and one raw buffer per
+    array; the buffers reference the arrays directly (no copy) for the
+    transport to write. The header holds only data, never code, so updates
+    received from another site are safe to decode.
+    """
+    buffers = []
+    header = json.dumps({key: _encode_weight(value, buffers) for key, value in weights.items()})
+    return header.encode(), buffers
+
+
+def deserialize_weights(header: bytes, buffers: List) -> Dict:
+    """Rebuild weights from serialize_weights() output; arrays view the buffers"""
+    return {key: _decode_weight(entry, buffers) for key, entry in json.loads(header).items()}
+
+
 class FederatedCoordinator:
     """
     Central coordinator for federated learning
     Aggregates model weights, NEVER sees raw data
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        compress_updates: bool = False,
+        sparsity: float = 0.5,
+        server_lr: float = 1.0,
+        server_momentum: float = 0.0,
+        client_fraction: float = 1.0,
+        parallel_training: bool = False
+    ):
         self.hospitals = {}
         self.global_model = None
         self.training_rounds = []
+        # After the first round, hospitals may send compressed deltas
+        # (top-k + int8) instead of full weights to cut network traffic
+        self.compress_updates = compress_updates
+        self.sparsity = sparsity
+        # FedAvgM: the server applies the averaged update with momentum
+        # (server_momentum=0, server_lr=1 is plain FedAvg)
+        self.server_lr = server_lr
+        self.server_momentum = server_momentum
+        self.server_velocity = {'coef': None, 'intercept': None}
+        # Share of hospitals sampled to train each round (1.0 = all)
+        self.client_fraction = client_fraction
+        # Train hospitals in worker processes. Off by default: spawning the
+        # pool costs more than it saves on the small simulated cohorts, so
+        # only large hospital datasets should opt in
+        self.parallel_training = parallel_training
+        # (K, D) coef / (K, C) intercept buffers reused across rounds
+        self._coef_stack = None
+        self._intercept_stack = None
+        # Inference model kept in sync with global_model (see get_global_model)
+        self._inference_model = None
+        self._inference_weights = None
         
     def register_hospital(self, hospital: Hospital):
         """Register a hospital in the federation"""
@@ -139,57 +329,138 @@ class FederatedCoordinator:
         - Each hospital contributes proportionally
         - Result: Global model without sharing data
         """
-        total_samples = sum(w['num_samples'] for w in weights_list)
+        weights_list = [self._full_weights(w) for w in weights_list]
+        first = weights_list[0]
+        coef_stack, intercept_stack = self._stack_weights(weights_list)
+        
+        counts = np.array([w['num_samples'] for w in weights_list], dtype=coef_stack.dtype)
+        
+        if NUMBA_AVAILABLE:
+            # Normalization and both weighted sums fused in the JIT kernel
+            avg_coef = np.empty(coef_stack.shape[1], dtype=coef_stack.dtype)
+            avg_intercept = np.empty(intercept_stack.shape[1], dtype=coef_stack.dtype)
+            _fedavg_kernel(coef_stack, intercept_stack, counts, avg_coef, avg_intercept)
+        else:
+            # Each hospital's share of the total samples, then one
+            # matrix-vector product each
+            fractions = counts / counts.sum()
+            avg_coef = fractions @ coef_stack
+            avg_intercept = fractions @ intercept_stack
         
-        # Weighted average of coefficients
-        avg_coef = np.zeros_like(weights_list[0]['coef'])
-        avg_intercept = np.zeros_like(weights_list[0]['intercept'])
-        
-        for weights in weights_list:
-            weight_factor = weights['num_samples'] / total_samples
-            avg_coef += weights['coef'] * weight_factor
-            avg_intercept += weights['intercept'] * weight_factor
+        return {
+            'coef': avg_coef.reshape(first['coef'].shape),
+            'intercept': avg_intercept.reshape(first['intercept'].shape),
+            'classes': first['classes']
+        }
+    
+    def _server_update(self, averaged: Dict) -> Dict:
+        """
+        FedAvgM server step: treat (averaged - global) as the round's update,
+        accumulate it into the velocity and move the global model by
+        server_lr * velocity. Fewer rounds are needed to converge.
+        """
+        if self.global_model is None or (self.server_momentum == 0 and self.server_lr == 1):
+            return averaged
+        
+        updated = dict(averaged)
+        for key in ('coef', 'intercept'):
+            delta = averaged[key] - self.global_model[key]
+            velocity = self.server_velocity[key]
+            if velocity is None:
+                velocity = delta
+            else:
+                velocity = self.server_momentum * velocity + delta
+            self.server_velocity[key] = velocity
+            updated[key] = self.global_model[key] + self.server_lr * velocity
+        return updated
+    
+    def _full_weights(self, weights: Dict) -> Dict:
+        """Expand a compressed update back into full weights (global + delta)"""
+        if 'coef_delta' not in weights:
+            return weights
         
+        base = self.global_model
         return {
-            'coef': avg_coef,
-            'intercept': avg_intercept,
-            'classes': weights_list[0]['classes']
+            'coef': base['coef'] + decompress_delta(weights['coef_delta'], base['coef'].shape),
+            'intercept': base['intercept'] + decompress_delta(
+                weights['intercept_delta'], base['intercept'].shape),
+            'classes': weights['classes'],
+            'num_samples': weights['num_samples']
         }
     
+    def _stack_weights(self, weights_list: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy each hospital's weights into one row of the (reused) stacks"""
+        first = weights_list[0]
+        coef_shape = (len(weights_list), first['coef'].size)
+        intercept_shape = (len(weights_list), first['intercept'].size)
+        
+        if (self._coef_stack is None
+                or self._coef_stack.shape != coef_shape
+                or self._coef_stack.dtype != first['coef'].dtype
+                or self._intercept_stack.shape != intercept_shape):
+            self._coef_stack = np.empty(coef_shape, dtype=first['coef'].dtype)
+            self._intercept_stack = np.empty(intercept_shape, dtype=first['coef'].dtype)
+        
+        for row, weights in enumerate(weights_list):
+            self._coef_stack[row] = weights['coef'].ravel()
+            self._intercept_stack[row] = weights['intercept'].ravel()
+        
+        return self._coef_stack, self._intercept_stack
+    
     def train_round(self, round_num: int) -> Dict:
         """
         Execute one round of federated training
         
         Steps:
-        1. Each hospital trains locally (data stays local)
+        1. Each sampled hospital trains locally (data stays local)
         2. Hospitals send weights to coordinator
         3. Coordinator averages weights (FedAvg)
         4. Updated global model sent back to hospitals
         """
-        print(f"\n🔄 Federated Training Round {round_num}")
-        print("=" * 60)
+        logger.info("Federated training round %d", round_num)
         
         round_info = {
             'round': round_num,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'hospitals': []
         }
         
-        # Step 1 & 2: Each hospital trains locally and sends weights
+        # Step 1 & 2: Each hospital trains locally and sends weights.
+        # Hospitals are independent, so with parallel_training they train in
+        # worker processes
+        global_weights = self.global_model if round_num > 1 else None
+        participants = self._sample_participants()
+        for hospital in participants.values():
+            if hospital.local_data is None:
+                raise ValueError(f"No local data available at {hospital.name}")
+        
+        if self.parallel_training and len(participants) > 1:
+            pool = _training_pool()
+            fits = [
+                pool.submit(_fit_local_model, *hospital.local_data, global_weights)
+                for hospital in participants.values()
+            ]
+        else:
+            fits = None
+        
         weights_list = []
-        for hospital_id, hospital in self.hospitals.items():
-            print(f"\n🏥 {hospital.name}")
-            print(f"   Training on {hospital.num_patients} local patients...")
-            
+        for i, (hospital_id, hospital) in enumerate(participants.items()):
             # Train on LOCAL data only (data never leaves hospital)
-            model, accuracy = hospital.train_local_model(
-                global_weights=self.global_model if round_num > 1 else None
-            )
+            if fits is None:
+                model, accuracy = hospital.train_local_model(global_weights)
+            else:
+                model, accuracy = fits[i].result()
+                hospital.record_local_model(model, accuracy)
             
-            print(f"   ✅ Local accuracy: {accuracy:.1%}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%s: trained on %d local patients, local accuracy %.1f%%",
+                            hospital.name, hospital.num_patients, accuracy * 100)
             
             # Extract weights (NOT data)
-            weights = hospital.get_model_weights()
+            if self.compress_updates and global_weights is not None:
+                weights = hospital.get_model_weights(global_weights, self.sparsity)
+            else:
+                weights = hospital.get_model_weights()
             weights_list.append(weights)
             
             round_info['hospitals'].append({
@@ -200,31 +471,54 @@ class FederatedCoordinator:
             })
         
         # Step 3: Aggregate weights (FedAvg)
-        print(f"\n📊 Coordinator: Aggregating weights from {len(weights_list)} hospitals...")
-        self.global_model = self.federated_averaging(weights_list)
-        print(f"   ✅ Global model updated")
+        self.global_model = self._server_update(self.federated_averaging(weights_list))
+        logger.info("Global model updated from %d hospitals", len(weights_list))
         
         self.training_rounds.append(round_info)
         
         return round_info
     
+    def _sample_participants(self) -> Dict[str, Hospital]:
+        """
+        Hospitals that train this round: a random client_fraction of the
+        federation (at least one), in registration order. Hospitals left out
+        still receive the updated global model in the next round they join.
+        """
+        if self.client_fraction >= 1:
+            return self.hospitals
+        
+        k = max(1, int(self.client_fraction * len(self.hospitals)))
+        chosen = set(random.sample(list(self.hospitals), k))
+        return {hid: h for hid, h in self.hospitals.items() if hid in chosen}
+    
     def get_global_model(self):
         """Return global model for inference"""
         if self.global_model is None:
             raise ValueError("No global model trained yet")
         
-        # Create a model with global weights
-        model = LogisticRegression()
-        model.coef_ = self.global_model['coef']
-        model.intercept_ = self.global_model['intercept']
-        model.classes_ = self.global_model['classes']
-        
-        return model
+        # One model reused across calls; weights refreshed only when the
+        # global model has been replaced since the last call
+        if self._inference_model is None:
+            self._inference_model = LogisticRegression()
+        if self._inference_weights is not self.global_model:
+            model = self._inference_model
+            model.coef_ = self.global_model['coef']
+            model.intercept_ = self.global_model['intercept']
+            model.classes_ = self.global_model['classes']
+            self._inference_weights = self.global_model
+        
+        return self._inference_model
+
+
+def _quiet(*args, **kwargs):
+    """Stand-in for print when banners are disabled"""
 
 
 def simulate_federated_training(
     num_rounds: int = 5,
-    hospitals_config: List[Dict] = None
+    hospitals_config: List[Dict] = None,
+    verbose: bool = True,
+    parallel_training: bool = False
 ) -> Tuple[FederatedCoordinator, Dict]:
     """
     Simulate complete federated learning workflow
@@ -232,11 +526,16 @@ def simulate_federated_training(
     Args:
         num_rounds: Number of training rounds
         hospitals_config: List of hospital configurations
+        verbose: Print the progress banners (per-round detail is logged)
+        parallel_training: Train hospitals in worker processes (worth it
+            only for large local datasets)
         
     Returns:
         coordinator: Trained federated coordinator
         summary: Training summary
     """
+    _say = print if verbose else _quiet
+    
     if hospitals_config is None:
         # Default: 3 hospitals with different sizes
         hospitals_config = [
@@ -245,16 +544,16 @@ def simulate_federated_training(
             {'id': 'HOSP-LA', 'name': 'LA University Hospital', 'patients': 1200}
         ]
     
-    print("\n╔════════════════════════════════════════════════════════════╗")
-    print("║     FEDERATED LEARNING: Privacy-Preserving Training       ║")
-    print("╚════════════════════════════════════════════════════════════╝")
+    _say("\n╔════════════════════════════════════════════════════════════╗")
+    _say("║     FEDERATED LEARNING: Privacy-Preserving Training       ║")
+    _say("╚════════════════════════════════════════════════════════════╝")
     
     # Initialize coordinator
-    coordinator = FederatedCoordinator()
+    coordinator = FederatedCoordinator(parallel_training=parallel_training)
     
     # Register hospitals and generate data
-    print("\n🏥 Registering Hospitals:")
-    print("-" * 60)
+    _say("\n🏥 Registering Hospitals:")
+    _say("-" * 60)
     for config in hospitals_config:
         hospital = Hospital(
             hospital_id=config['id'],
@@ -266,16 +565,16 @@ def simulate_federated_training(
         hospital.generate_synthetic_data(seed=hash(config['id']) % 1000)
         
         coordinator.register_hospital(hospital)
-        print(f"✅ {hospital.name}: {hospital.num_patients} patients")
+        _say(f"✅ {hospital.name}: {hospital.num_patients} patients")
     
     total_patients = sum(h['patients'] for h in hospitals_config)
-    print(f"\n📊 Total patients across federation: {total_patients}")
-    print(f"🔒 Privacy guarantee: Raw data NEVER leaves hospitals")
+    _say(f"\n📊 Total patients across federation: {total_patients}")
+    _say(f"🔒 Privacy guarantee: Raw data NEVER leaves hospitals")
     
     # Execute training rounds
-    print("\n" + "=" * 60)
-    print("STARTING FEDERATED TRAINING")
-    print("=" * 60)
+    _say("\n" + "=" * 60)
+    _say("STARTING FEDERATED TRAINING")
+    _say("=" * 60)
     
     for round_num in range(1, num_rounds + 1):
         coordinator.train_round(round_num)
@@ -289,40 +588,43 @@ def simulate_federated_training(
         'training_history': coordinator.training_rounds
     }
     
-    print("\n╔════════════════════════════════════════════════════════════╗")
-    print("║              ✅ FEDERATED TRAINING COMPLETE                ║")
-    print("╚════════════════════════════════════════════════════════════╝")
-    print(f"\n📊 Summary:")
-    print(f"   - {len(hospitals_config)} hospitals trained collaboratively")
-    print(f"   - {total_patients} total patients (data stayed local)")
-    print(f"   - {num_rounds} training rounds completed")
-    print(f"   - Global model ready for inference")
-    print(f"\n🔒 Privacy: NO patient data was ever shared between hospitals!")
+    _say("\n╔════════════════════════════════════════════════════════════╗")
+    _say("║              ✅ FEDERATED TRAINING COMPLETE                ║")
+    _say("╚════════════════════════════════════════════════════════════╝")
+    _say(f"\n📊 Summary:")
+    _say(f"   - {len(hospitals_config)} hospitals trained collaboratively")
+    _say(f"   - {total_patients} total patients (data stayed local)")
+    _say(f"   - {num_rounds} training rounds completed")
+    _say(f"   - Global model ready for inference")
+    _say(f"\n🔒 Privacy: NO patient data was ever shared between hospitals!")
     
     return coordinator, summary
 
 
-def evaluate_federated_vs_centralized(coordinator: FederatedCoordinator):
+def evaluate_federated_vs_centralized(coordinator: FederatedCoordinator, verbose: bool = True):
     """
     Compare federated model to what we'd get if we pooled all data (centralized)
     Shows that federated learning works!
     """
-    print("\n📊 Federated vs Centralized Comparison:")
-    print("-" * 60)
+    _say = print if verbose else _quiet
+    
+    _say("\n📊 Federated vs Centralized Comparison:")
+    _say("-" * 60)
     
     # Get federated model
     federated_model = coordinator.get_global_model()
     
     # Pool all data (what traditional ML would do - but violates privacy!)
-    all_X = []
-    all_y = []
-    for hospital in coordinator.hospitals.values():
-        X, y = hospital.local_data
-        all_X.append(X)
-        all_y.append(y)
+    # Each hospital's rows are copied straight into its slice of one buffer
+    datasets = [hospital.local_data for hospital in coordinator.hospitals.values()]
+    offsets = np.cumsum([0] + [len(y) for _, y in datasets])
     
-    X_pooled = np.vstack(all_X)
-    y_pooled = np.concatenate(all_y)
+    X_first, y_first = datasets[0]
+    X_pooled = np.empty((offsets[-1], X_first.shape[1]), dtype=X_first.dtype)
+    y_pooled = np.empty(offsets[-1], dtype=y_first.dtype)
+    for (X, y), start, end in zip(datasets, offsets[:-1], offsets[1:]):
+        X_pooled[start:end] = X
+        y_pooled[start:end] = y
     
     # Train centralized model
     centralized_model = LogisticRegression(max_iter=100, random_state=42)
@@ -332,10 +634,10 @@ def evaluate_federated_vs_centralized(coordinator: FederatedCoordinator):
     fed_accuracy = federated_model.score(X_pooled, y_pooled)
     cent_accuracy = centralized_model.score(X_pooled, y_pooled)
     
-    print(f"Federated Model Accuracy:   {fed_accuracy:.1%}")
-    print(f"Centralized Model Accuracy: {cent_accuracy:.1%}")
-    print(f"Difference:                 {abs(fed_accuracy - cent_accuracy):.1%}")
-    print("\n✅ Federated learning achieves similar accuracy WITHOUT sharing data!")
+    _say(f"Federated Model Accuracy:   {fed_accuracy:.1%}")
+    _say(f"Centralized Model Accuracy: {cent_accuracy:.1%}")
+    _say(f"Difference:                 {abs(fed_accuracy - cent_accuracy):.1%}")
+    _say("\n✅ Federated learning achieves similar accuracy WITHOUT sharing data!")
     
     return {
         'federated_accuracy': fed_accuracy,
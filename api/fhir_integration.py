@@ -10,8 +10,10 @@ Standards implemented:
 
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, timezone
+from functools import lru_cache
 import json
+import re
 
 
 # =============================================================================
@@ -94,6 +96,32 @@ LOINC_CODES = {
     "14959-1": "microalbumin",            # Microalbumin
 }
 
+# Alternate LOINC codes that fill the same patient field
+_LOINC_FIELD_ALIASES = {
+    "ldl_direct": "ldl",
+    "hba1c_alt": "hba1c",
+    "glucose": "fasting_glucose",
+    "egfr_alt": "egfr",
+}
+
+# LOINC code -> FHIRPatientData attribute, for the observations we map
+LOINC_TO_FIELD = {
+    code: _LOINC_FIELD_ALIASES.get(name, name)
+    for code, name in LOINC_CODES.items()
+    if _LOINC_FIELD_ALIASES.get(name, name) in FHIRPatientData.__dataclass_fields__
+}
+
+# Coding systems recognized for observations and conditions
+LOINC_SYSTEMS = frozenset({"http://loinc.org"})
+SNOMED_SYSTEMS = frozenset({"http://snomed.info/sct", "urn:oid:2.16.840.1.113883.6.96"})
+
+
+@lru_cache(maxsize=256)
+def _is_snomed_system(system: str) -> bool:
+    """Canonical SNOMED URL, or any other system naming SNOMED (cached per string)"""
+    return system in SNOMED_SYSTEMS or "snomed" in system.lower()
+
+
 # SNOMED codes for conditions
 SNOMED_CONDITIONS = {
     "73211009": "has_diabetes",           # Diabetes mellitus
@@ -117,6 +145,31 @@ MEDICATION_CLASSES = {
                      "empagliflozin", "liraglutide"],
 }
 
+# Medication class -> FHIRPatientData flag
+MEDICATION_CLASS_FIELDS = {
+    "antihypertensive": "on_bp_medication",
+    "statin": "on_statin",
+    "antidiabetic": "on_antidiabetic",
+}
+
+# Every drug name in one alternation, so each medication text is scanned
+# once; matched names map straight to the flag they set
+_DRUG_FIELD = {
+    drug: MEDICATION_CLASS_FIELDS[med_class]
+    for med_class, drug_names in MEDICATION_CLASSES.items()
+    for drug in drug_names
+}
+_DRUG_RE = re.compile("|".join(map(re.escape, _DRUG_FIELD)))
+
+
+@lru_cache(maxsize=1024)
+def _parse_birth_date(birth_date: str) -> Optional[date]:
+    """Parse a FHIR birthDate (YYYY-MM-DD); None if partial or malformed"""
+    try:
+        return date.fromisoformat(birth_date)
+    except ValueError:
+        return None
+
 
 def parse_fhir_patient(patient_resource: Dict[str, Any]) -> FHIRPatientData:
     """
@@ -135,12 +188,10 @@ def parse_fhir_patient(patient_resource: Dict[str, Any]) -> FHIRPatientData:
     # Extract birth date and calculate age
     if "birthDate" in patient_resource:
         data.birth_date = patient_resource["birthDate"]
-        try:
-            birth = datetime.strptime(data.birth_date, "%Y-%m-%d")
-            today = datetime.now()
-            data.age = (today - birth).days / 365.25
-        except:
-            pass
+        # Malformed bundles may carry a non-string (possibly unhashable) value
+        birth = _parse_birth_date(data.birth_date) if isinstance(data.birth_date, str) else None
+        if birth is not None:
+            data.age = (date.today() - birth).days / 365.25
     
     # Extract sex
     gender = patient_resource.get("gender", "").lower()
@@ -152,6 +203,74 @@ def parse_fhir_patient(patient_resource: Dict[str, Any]) -> FHIRPatientData:
     return data
 
 
+def _apply_observation(obs: Dict[str, Any], patient_data: FHIRPatientData) -> None:
+    """Copy one Observation's vital or lab value onto patient_data"""
+    # Get LOINC code
+    code = next(
+        (coding.get("code") for coding in obs.get("code", {}).get("coding", ())
+         if coding.get("system") in LOINC_SYSTEMS),
+        None
+    )
+    
+    field_name = LOINC_TO_FIELD.get(code)
+    if field_name is None:
+        return
+    
+    # Extract value (coded values like smoking status are not mapped yet)
+    value = obs.get("valueQuantity", {}).get("value")
+    if value is None:
+        return
+    
+    # Map to patient data field
+    setattr(patient_data, field_name, float(value))
+
+
+def _apply_condition(condition: Dict[str, Any], patient_data: FHIRPatientData) -> None:
+    """Set the condition flag for one active Condition"""
+    # Only consider active conditions
+    clinical_status = condition.get("clinicalStatus", {})
+    if isinstance(clinical_status, dict):
+        status_code = clinical_status.get("coding", [{}])[0].get("code", "")
+        if status_code not in ["active", "recurrence", "relapse"]:
+            return
+    
+    # Get SNOMED code
+    code = None
+    if "code" in condition and "coding" in condition["code"]:
+        for coding in condition["code"]["coding"]:
+            if _is_snomed_system(coding.get("system", "")):
+                code = coding.get("code")
+                break
+    
+    if code and code in SNOMED_CONDITIONS:
+        field_name = SNOMED_CONDITIONS[code]
+        setattr(patient_data, field_name, 1)
+
+
+def _apply_medication(med: Dict[str, Any], patient_data: FHIRPatientData) -> None:
+    """Set the medication class flags for one medication resource"""
+    # Get medication name
+    med_name = ""
+    if "medicationCodeableConcept" in med:
+        med_name = med["medicationCodeableConcept"].get("text", "").lower()
+    elif "medicationReference" in med:
+        # Would need to resolve reference
+        pass
+    
+    # Check medication classes
+    for match in _DRUG_RE.finditer(med_name):
+        setattr(patient_data, _DRUG_FIELD[match.group()], 1)
+
+
+def _apply_patient(patient_resource: Dict[str, Any], patient_data: FHIRPatientData) -> None:
+    """Replace patient_data's demographics with those of a Patient resource"""
+    demographics = parse_fhir_patient(patient_resource)
+    patient_data.patient_id = demographics.patient_id
+    patient_data.birth_date = demographics.birth_date
+    patient_data.age = demographics.age
+    patient_data.sex = demographics.sex
+
+
 def parse_fhir_observations(observations: List[Dict[str, Any]], 
                             patient_data: FHIRPatientData) -> FHIRPatientData:
     """
@@ -165,55 +284,7 @@ def parse_fhir_observations(observations: List[Dict[str, Any]],
         Updated FHIRPatientData with vitals and labs
     """
     for obs in observations:
-        # Get LOINC code
-        code = None
-        if "code" in obs and "coding" in obs["code"]:
-            for coding in obs["code"]["coding"]:
-                if coding.get("system") == "http://loinc.org":
-                    code = coding.get("code")
-                    break
-        
-        if not code or code not in LOINC_CODES:
-            continue
-        
-        field_name = LOINC_CODES[code]
-        
-        # Extract value
-        value = None
-        if "valueQuantity" in obs:
-            value = obs["valueQuantity"].get("value")
-        elif "valueCodeableConcept" in obs:
-            # Handle coded values (like smoking status)
-            pass
-        
-        if value is None:
-            continue
-        
-        # Map to patient data field
-        if field_name == "bp_systolic":
-            patient_data.bp_systolic = float(value)
-        elif field_name == "bp_diastolic":
-            patient_data.bp_diastolic = float(value)
-        elif field_name == "heart_rate":
-            patient_data.heart_rate = float(value)
-        elif field_name == "bmi":
-            patient_data.bmi = float(value)
-        elif field_name == "total_cholesterol":
-            patient_data.total_cholesterol = float(value)
-        elif field_name == "hdl":
-            patient_data.hdl = float(value)
-        elif field_name in ["ldl", "ldl_direct"]:
-            patient_data.ldl = float(value)
-        elif field_name == "triglycerides":
-            patient_data.triglycerides = float(value)
-        elif field_name in ["hba1c", "hba1c_alt"]:
-            patient_data.hba1c = float(value)
-        elif field_name in ["fasting_glucose", "glucose"]:
-            patient_data.fasting_glucose = float(value)
-        elif field_name == "creatinine":
-            patient_data.creatinine = float(value)
-        elif field_name in ["egfr", "egfr_alt"]:
-            patient_data.egfr = float(value)
+        _apply_observation(obs, patient_data)
     
     return patient_data
 
@@ -231,24 +302,7 @@ def parse_fhir_conditions(conditions: List[Dict[str, Any]],
         Updated FHIRPatientData with condition flags
     """
     for condition in conditions:
-        # Only consider active conditions
-        clinical_status = condition.get("clinicalStatus", {})
-        if isinstance(clinical_status, dict):
-            status_code = clinical_status.get("coding", [{}])[0].get("code", "")
-            if status_code not in ["active", "recurrence", "relapse"]:
-                continue
-        
-        # Get SNOMED code
-        code = None
-        if "code" in condition and "coding" in condition["code"]:
-            for coding in condition["code"]["coding"]:
-                if "snomed" in coding.get("system", "").lower():
-                    code = coding.get("code")
-                    break
-        
-        if code and code in SNOMED_CONDITIONS:
-            field_name = SNOMED_CONDITIONS[code]
-            setattr(patient_data, field_name, 1)
+        _apply_condition(condition, patient_data)
     
     return patient_data
 
@@ -266,27 +320,21 @@ def parse_fhir_medications(medications: List[Dict[str, Any]],
         Updated FHIRPatientData with medication flags
     """
     for med in medications:
-        # Get medication name
-        med_name = ""
-        if "medicationCodeableConcept" in med:
-            med_name = med["medicationCodeableConcept"].get("text", "").lower()
-        elif "medicationReference" in med:
-            # Would need to resolve reference
-            pass
-        
-        # Check medication classes
-        for med_class, drug_names in MEDICATION_CLASSES.items():
-            if any(drug in med_name for drug in drug_names):
-                if med_class == "antihypertensive":
-                    patient_data.on_bp_medication = 1
-                elif med_class == "statin":
-                    patient_data.on_statin = 1
-                elif med_class == "antidiabetic":
-                    patient_data.on_antidiabetic = 1
+        _apply_medication(med, patient_data)
     
     return patient_data
 
 
+# Bundle resource type -> handler that updates the patient data in place
+_BUNDLE_HANDLERS = {
+    "Patient": _apply_patient,
+    "Observation": _apply_observation,
+    "Condition": _apply_condition,
+    "MedicationStatement": _apply_medication,
+    "MedicationRequest": _apply_medication,
+}
+
+
 def fhir_bundle_to_patient(bundle: Dict[str, Any]) -> FHIRPatientData:
     """
     Convert a FHIR Bundle containing patient data to our format
@@ -297,38 +345,30 @@ def fhir_bundle_to_patient(bundle: Dict[str, Any]) -> FHIRPatientData:
     Returns:
         FHIRPatientData ready for risk prediction
     """
-    patient_data = None
-    observations = []
-    conditions = []
-    medications = []
+    patient_data = FHIRPatientData(patient_id="unknown")
     
-    # Sort resources by type
-    for entry in bundle.get("entry", []):
+    # Each resource is parsed as it is seen, in a single pass over the bundle
+    for entry in bundle.get("entry", ()):
         resource = entry.get("resource", {})
-        resource_type = resource.get("resourceType")
-        
-        if resource_type == "Patient":
-            patient_data = parse_fhir_patient(resource)
-        elif resource_type == "Observation":
-            observations.append(resource)
-        elif resource_type == "Condition":
-            conditions.append(resource)
-        elif resource_type in ["MedicationStatement", "MedicationRequest"]:
-            medications.append(resource)
-    
-    if patient_data is None:
-        patient_data = FHIRPatientData(patient_id="unknown")
-    
-    # Parse additional resources
-    patient_data = parse_fhir_observations(observations, patient_data)
-    patient_data = parse_fhir_conditions(conditions, patient_data)
-    patient_data = parse_fhir_medications(medications, patient_data)
+        handler = _BUNDLE_HANDLERS.get(resource.get("resourceType"))
+        if handler is not None:
+            handler(resource, patient_data)
     
-    patient_data.last_updated = datetime.now().isoformat()
+    patient_data.last_updated = datetime.now(timezone.utc).isoformat()
     
     return patient_data
 
 
+# FHIRPatientData fields passed to /predict/multi-disease (same key names):
+# the required demographics/vitals first, then the optional labs and flags
+API_INPUT_FIELDS = (
+    "age", "sex", "bmi", "bp_systolic", "bp_diastolic",
+    "hba1c", "hdl", "ldl", "total_cholesterol", "triglycerides",
+    "fasting_glucose", "creatinine", "egfr", "has_diabetes",
+    "on_bp_medication", "smoking_pack_years",
+)
+
+
 def patient_data_to_api_input(fhir_data: FHIRPatientData) -> Dict[str, Any]:
     """
     Convert FHIRPatientData to our API's MultiDiseaseInput format
@@ -340,45 +380,10 @@ def patient_data_to_api_input(fhir_data: FHIRPatientData) -> Dict[str, Any]:
         Dict compatible with /predict/multi-disease endpoint
     """
     # Only include non-None values
-    result = {}
-    
-    # Required fields (must have values)
-    if fhir_data.age is not None:
-        result["age"] = fhir_data.age
-    if fhir_data.sex is not None:
-        result["sex"] = fhir_data.sex
-    if fhir_data.bmi is not None:
-        result["bmi"] = fhir_data.bmi
-    if fhir_data.bp_systolic is not None:
-        result["bp_systolic"] = fhir_data.bp_systolic
-    if fhir_data.bp_diastolic is not None:
-        result["bp_diastolic"] = fhir_data.bp_diastolic
-    
-    # Optional fields
-    if fhir_data.hba1c is not None:
-        result["hba1c"] = fhir_data.hba1c
-    if fhir_data.hdl is not None:
-        result["hdl"] = fhir_data.hdl
-    if fhir_data.ldl is not None:
-        result["ldl"] = fhir_data.ldl
-    if fhir_data.total_cholesterol is not None:
-        result["total_cholesterol"] = fhir_data.total_cholesterol
-    if fhir_data.triglycerides is not None:
-        result["triglycerides"] = fhir_data.triglycerides
-    if fhir_data.fasting_glucose is not None:
-        result["fasting_glucose"] = fhir_data.fasting_glucose
-    if fhir_data.creatinine is not None:
-        result["creatinine"] = fhir_data.creatinine
-    if fhir_data.egfr is not None:
-        result["egfr"] = fhir_data.egfr
-    if fhir_data.has_diabetes is not None:
-        result["has_diabetes"] = fhir_data.has_diabetes
-    if fhir_data.on_bp_medication is not None:
-        result["on_bp_medication"] = fhir_data.on_bp_medication
-    if fhir_data.smoking_pack_years is not None:
-        result["smoking_pack_years"] = fhir_data.smoking_pack_years
-    
-    return result
+    return {
+        field: value for field in API_INPUT_FIELDS
+        if (value := getattr(fhir_data, field)) is not None
+    }
 
 
 # =============================================================================
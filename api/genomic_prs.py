@@ -5,10 +5,37 @@ Precision medicine: Separates genetic vs lifestyle risk factors
 Based on genome-wide association studies (GWAS) for chronic disease risk
 """
 
+import heapq
+import math
+import re
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Union, Iterable
 import json
 
+# Numba is optional - score_cohort_fast() falls back to a NumPy matrix product without it
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _batch_prs(dosage, weights, max_score):
+        """Normalized PRS per dosage row, rows scored in parallel"""
+        out = np.empty(dosage.shape[0])
+        for i in prange(dosage.shape[0]):
+            s = 0.0
+            for j in range(weights.shape[0]):
+                s += dosage[i, j] * weights[j]
+            out[i] = s / max_score
+        return out
+
+_SQRT2 = math.sqrt(2.0)
+
+# Risk-allele frequency used by generate_sample_genotypes (anything else: high)
+_SAMPLE_RISK_ALLELE_PROB = {'low': 0.2, 'average': 0.5, 'high': 0.8}
+
 # Real SNPs associated with chronic disease risk (from GWAS studies)
 # Format: (SNP ID, risk allele, effect size/weight)
 DISEASE_RISK_SNPS = [
@@ -27,6 +54,17 @@ DISEASE_RISK_SNPS = [
     {'snp': 'rs7754840', 'gene': 'CDKAL1', 'risk_allele': 'C', 'weight': 0.08, 'description': 'Insulin secretion'}
 ]
 
+# rsids scored above, for O(1) filtering of raw genotype files
+_TARGET_RSIDS = frozenset(snp['snp'] for snp in DISEASE_RISK_SNPS)
+
+# A target rsid at the start of a line, then chromosome, position and the
+# genotype column; the regex engine skips every other line without Python
+# ever seeing it
+_TARGET_ROW_RE = re.compile(
+    r'^ *(' + '|'.join(map(re.escape, sorted(_TARGET_RSIDS))) + r')\t[^\t\n]*\t[^\t\n]*\t([^\t\r\n]+)',
+    re.MULTILINE
+)
+
 
 class GenomicRiskCalculator:
     """Calculate polygenic risk score from genetic variants"""
@@ -35,47 +73,81 @@ class GenomicRiskCalculator:
         self.snps = DISEASE_RISK_SNPS
         self.max_possible_score = sum(snp['weight'] * 2 for snp in self.snps)  # 2 = homozygous
         
-    def calculate_prs(self, genotypes: Dict[str, str]) -> Dict[str, Any]:
+        # Per-SNP columns, so a PRS is one vector product instead of a loop
+        self._snp_ids = tuple(snp['snp'] for snp in self.snps)
+        self._risk_alleles = tuple(snp['risk_allele'] for snp in self.snps)
+        self._weights = np.array([snp['weight'] for snp in self.snps])
+        
+        # For sample genotypes: the other allele per SNP (simplified) and a
+        # PCG64 generator for batched draws
+        self._other_alleles = tuple('A' if allele != 'A' else 'G' for allele in self._risk_alleles)
+        self._rng = np.random.default_rng()
+        
+    def encode_genotypes(self, genotypes: Dict[str, str]) -> np.ndarray:
+        """
+        Encode genotypes as a risk-allele dosage vector (0, 1 or 2 per SNP,
+        in self.snps order); a missing genotype counts as the population
+        average of 1 risk allele
+        """
+        return np.fromiter(
+            (genotypes[snp_id].count(risk_allele) if snp_id in genotypes else 1
+             for snp_id, risk_allele in zip(self._snp_ids, self._risk_alleles)),
+            dtype=np.uint8,
+            count=len(self._snp_ids)
+        )
+    
+    def score_cohort(self, dosage_matrix: np.ndarray) -> np.ndarray:
+        """
+        Raw PRS for many patients at once
+        
+        Args:
+            dosage_matrix: (patients, SNPs) matrix of encode_genotypes() rows
+        
+        Returns:
+            Raw score per patient (divide by max_possible_score to normalize)
+        """
+        return dosage_matrix.astype(self._weights.dtype) @ self._weights
+    
+    def score_cohort_fast(self, dosage_matrix: np.ndarray) -> np.ndarray:
+        """
+        Normalized PRS (0-1) for many patients at once, via the Numba kernel
+        when available
+        
+        Args:
+            dosage_matrix: (patients, SNPs) matrix of encode_genotypes() rows
+        
+        Returns:
+            Normalized score per patient: calculate_prs()['prs_normalized'] up
+            to floating-point summation order (within ~1e-12 relative)
+        """
+        if NUMBA_AVAILABLE:
+            return _batch_prs(np.ascontiguousarray(dosage_matrix), self._weights, self.max_possible_score)
+        return self.score_cohort(dosage_matrix) / self.max_possible_score
+    
+    def calculate_prs(
+        self,
+        genotypes: Union[Dict[str, str], np.ndarray],
+        detailed: bool = True
+    ) -> Dict[str, Any]:
         """
         Calculate PRS from patient genotypes
         
         Args:
             genotypes: Dict of {snp_id: genotype}
                       genotype can be: 'AA', 'AT', 'TT', etc.
+                      or a dosage vector from encode_genotypes()
+            detailed: Include the per-SNP 'snp_contributions' breakdown
         
         Returns:
             PRS score and details
         """
-        raw_score = 0
-        snp_contributions = []
-        
-        for snp_info in self.snps:
-            snp_id = snp_info['snp']
-            risk_allele = snp_info['risk_allele']
-            weight = snp_info['weight']
-            
-            if snp_id not in genotypes:
-                # Missing genotype - use population average (1 risk allele)
-                count = 1
-                genotype = 'N/A'
-            else:
-                genotype = genotypes[snp_id]
-                # Count risk alleles
-                count = genotype.count(risk_allele)
-            
-            contribution = count * weight
-            raw_score += contribution
-            
-            snp_contributions.append({
-                'snp': snp_id,
-                'gene': snp_info['gene'],
-                'genotype': genotype,
-                'risk_allele': risk_allele,
-                'risk_allele_count': count,
-                'weight': weight,
-                'contribution': contribution,
-                'description': snp_info['description']
-            })
+        if isinstance(genotypes, np.ndarray):
+            counts = genotypes
+            genotypes = {}  # Genotype strings are not known for a dosage vector
+        else:
+            counts = self.encode_genotypes(genotypes)
+        contributions = counts * self._weights
+        raw_score = float(contributions.sum())
         
         # Normalize to 0-1 scale
         normalized_score = raw_score / self.max_possible_score
@@ -95,28 +167,45 @@ class GenomicRiskCalculator:
             category = "High Genetic Risk"
             category_desc = "Above average genetic predisposition"
         
-        return {
+        result = {
             'prs_raw': raw_score,
             'prs_normalized': normalized_score,
             'prs_percentile': percentile,
             'category': category,
             'category_description': category_desc,
-            'snp_contributions': sorted(
-                snp_contributions, 
-                key=lambda x: x['contribution'], 
-                reverse=True
-            ),
             'top_risk_genes': [
-                snp_contributions[i]['gene'] 
-                for i in range(min(3, len(snp_contributions)))
+                self.snps[i]['gene']
+                for i in heapq.nlargest(3, range(len(self.snps)), key=contributions.__getitem__)
             ]
         }
+        
+        # The full sorted breakdown is only built when asked for
+        if detailed:
+            snp_contributions = [
+                {
+                    'snp': snp_info['snp'],
+                    'gene': snp_info['gene'],
+                    'genotype': genotypes.get(snp_info['snp'], 'N/A'),
+                    'risk_allele': snp_info['risk_allele'],
+                    'risk_allele_count': int(count),
+                    'weight': snp_info['weight'],
+                    'contribution': float(contribution),
+                    'description': snp_info['description']
+                }
+                for snp_info, count, contribution in zip(self.snps, counts, contributions)
+            ]
+            result['snp_contributions'] = sorted(
+                snp_contributions, 
+                key=lambda x: x['contribution'], 
+                reverse=True
+            )
+        
+        return result
     
     def _score_to_percentile(self, score: float, mean: float = 0.5, std: float = 0.15) -> float:
         """Convert normalized score to population percentile"""
-        from scipy import stats
         z = (score - mean) / std
-        percentile = stats.norm.cdf(z) * 100
+        percentile = 0.5 * (1.0 + math.erf(z / _SQRT2)) * 100  # Standard normal CDF
         return min(99, max(1, percentile))  # Bound between 1-99
     
     def generate_sample_genotypes(self, risk_level: str = 'average') -> Dict[str, str]:
@@ -126,32 +215,18 @@ class GenomicRiskCalculator:
         Args:
             risk_level: 'low', 'average', or 'high'
         """
-        genotypes = {}
+        # Probability of drawing the risk allele: mostly protective (low),
+        # a mix (average) or mostly risk alleles (high)
+        prob_risk = _SAMPLE_RISK_ALLELE_PROB.get(risk_level, 0.8)
         
-        for snp_info in self.snps:
-            snp_id = snp_info['snp']
-            risk_allele = snp_info['risk_allele']
-            
-            # Infer other allele (simplified)
-            other_allele = 'A' if risk_allele != 'A' else 'G'
-            
-            if risk_level == 'low':
-                # Mostly protective alleles
-                prob_risk = 0.2
-            elif risk_level == 'average':
-                # Mix of risk and protective
-                prob_risk = 0.5
-            else:  # high
-                # Mostly risk alleles
-                prob_risk = 0.8
-            
-            # Generate random genotype
-            allele1 = risk_allele if np.random.random() < prob_risk else other_allele
-            allele2 = risk_allele if np.random.random() < prob_risk else other_allele
-            
-            genotypes[snp_id] = f"{allele1}{allele2}"
+        # Both alleles of every SNP in one draw
+        picks = self._rng.random((len(self._snp_ids), 2)) < prob_risk
         
-        return genotypes
+        return {
+            snp_id: (risk_allele if first else other_allele) + (risk_allele if second else other_allele)
+            for snp_id, risk_allele, other_allele, (first, second)
+            in zip(self._snp_ids, self._risk_alleles, self._other_alleles, picks.tolist())
+        }
 
 
 def combine_genetic_and_clinical_risk(
@@ -268,30 +343,75 @@ def _get_actionable_recommendations(genetic: float, clinical: float) -> List[str
     return recommendations
 
 
-def parse_23andme_file(file_content: str) -> Dict[str, str]:
+def parse_23andme_file(file_content: Union[str, Iterable[str]]) -> Dict[str, str]:
     """
     Parse 23andMe raw data file format
     
     Format:
     # rsid chromosome position genotype
     rs7903146 10 114758349 CT
+    
+    Accepts the whole file as a string, or any iterable of lines (e.g. an
+    open text or gzip file) so large files can be streamed.
     """
-    genotypes = {}
+    if isinstance(file_content, str):
+        # Only ~10 of ~600k rows are wanted: pull them out in one regex scan
+        return {
+            match.group(1): match.group(2).strip()
+            for match in _TARGET_ROW_RE.finditer(file_content)
+        }
     
-    for line in file_content.split('\n'):
+    genotypes = {}
+    for line in file_content:
+        # Skip comments before doing any other work on the line
+        if line[:1] == '#':
+            continue
+        
         line = line.strip()
         
         # Skip comments and empty lines
         if not line or line.startswith('#'):
             continue
         
-        parts = line.split('\t')
+        parts = line.split('\t', 4)
         if len(parts) >= 4:
             rsid = parts[0]
-            genotype = parts[3]
             
             # Only include SNPs we care about
-            if rsid in [snp['snp'] for snp in DISEASE_RISK_SNPS]:
-                genotypes[rsid] = genotype
+            if rsid in _TARGET_RSIDS:
+                genotypes[rsid] = parts[3]
     
     return genotypes
+
+
+def parse_23andme_path(path: str) -> Dict[str, str]:
+    """
+    Parse a 23andMe raw data file from disk without loading it as one string
+    (.gz/.zip compression is detected from the file name)
+    """
+    return _read_23andme(path)
+
+
+def _read_23andme(source) -> Dict[str, str]:
+    """rsid -> genotype for the target SNPs in a tab-separated 23andMe file"""
+    # Imported here so the API doesn't pay for pandas unless files are read from disk
+    import pandas as pd
+    
+    try:
+        df = pd.read_csv(
+            source, sep='\t', comment='#', header=None,
+            usecols=[0, 3], names=['rsid', 'gt'],
+            dtype=str, keep_default_na=False, engine='c'
+        )
+    except (pd.errors.EmptyDataError, ValueError):
+        # No data rows, or fewer than four columns
+        return {}
+    
+    # Only include SNPs we care about (rows missing a genotype are skipped)
+    gt = df['gt']
+    df = df[df['rsid'].isin(_TARGET_RSIDS) & gt.notna() & (gt != '')]
+    return dict(zip(df['rsid'], df['gt']))
+
+
+# Shared calculator: it holds no per-request state, so build its arrays once
+PRS_CALCULATOR = GenomicRiskCalculator()
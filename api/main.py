@@ -32,7 +32,8 @@ ml_module.disease_model = ml_disease_model
 
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 # sqlite3 import removed - using PostgreSQL via execute_query
@@ -41,7 +42,8 @@ import json
 import secrets
 import hashlib
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import pickle
 import numpy as np
 import requests as http_requests
@@ -49,10 +51,22 @@ import requests as http_requests
 # Import database abstraction layer
 from database import (
     USE_POSTGRES, get_db_connection, get_db_cursor, 
-    execute_query, execute_many, get_placeholder,
+    execute_query, execute_many, get_placeholder, AuditBuffer, register_hot_query,
     init_postgres_tables
 )
 
+# Access log and patient data audit entries are written in batches off the
+# request path
+access_log_buffer = AuditBuffer(
+    "access_log",
+    ("timestamp", "user_id", "user_role", "purpose", "data_type", "patient_id",
+     "granted", "reason", "ip_address")
+)
+patient_audit_buffer = AuditBuffer(
+    "patient_data_audit",
+    ("timestamp", "patient_id", "action", "user_id", "user_role", "details")
+)
+
 # SHAP is optional - heavy dependency not needed for cloud deployment
 try:
     import shap
@@ -61,6 +75,14 @@ except ImportError:
     shap = None
     SHAP_AVAILABLE = False
 
+# orjson is optional - used for static JSON payloads, stdlib json otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 # Import access control system
 from access_control import (
     Role, Purpose, DataType, AccessRequest, AccessDecision,
@@ -131,6 +153,8 @@ from data_exchange import (
     decrypt_received_data,
     minimize_data,
     create_exchange_package,
+    create_exchange_packages,
+    parse_categories,
     DataCategory,
     ExchangeStatus
 )
@@ -154,7 +178,7 @@ from federated_learning import (
 
 # Import genomic PRS utilities
 from genomic_prs import (
-    GenomicRiskCalculator,
+    PRS_CALCULATOR,
     combine_genetic_and_clinical_risk,
     parse_23andme_file
 )
@@ -688,11 +712,11 @@ def init_database():
             ON CONFLICT (admin_id) DO UPDATE SET 
                 password_hash = EXCLUDED.password_hash,
                 super_admin = EXCLUDED.super_admin
-        """, ("admin", "admin@biotek.health", default_password_hash, "System Administrator", datetime.now().isoformat()))
+        """, ("admin", "admin@biotek.health", default_password_hash, "System Administrator", datetime.now(timezone.utc).isoformat()))
         
         # Seed/update default staff accounts (upsert)
         default_pw = hash_password("demo123")
-        now = datetime.now().isoformat()
+        now = datetime.now(timezone.utc).isoformat()
         demo_accounts = [
             ("doctor_DOC001", "doctor@biotek.health", default_pw, "doctor", "Dr. Sarah Smith", "EMP-DOC-001", "Internal Medicine"),
             ("nurse_NUR001", "nurse@biotek.health", default_pw, "nurse", "Emily Johnson RN", "EMP-NUR-001", "Patient Care"),
@@ -893,6 +917,11 @@ class SendDataRequest(BaseModel):
     exchange_id: str
     admin_id: str  # Admin approving the send
 
+class SendBatchDataRequest(BaseModel):
+    """Send several approved exchanges to one institution as one package"""
+    exchange_ids: List[str]
+    admin_id: str  # Admin approving the send
+
 class PatientDataDownloadRequest(BaseModel):
     """Request to download patient data"""
     patient_id: str
@@ -1044,16 +1073,11 @@ def log_access_attempt(
     ip_address: Optional[str] = None
 ):
     """Log access attempt to database (PostgreSQL or SQLite)"""
-    ph = get_placeholder()
-    query = f"""
-        INSERT INTO access_log 
-        (timestamp, user_id, user_role, purpose, data_type, patient_id, granted, reason, ip_address)
-        VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-    """
     # PostgreSQL needs actual boolean, SQLite uses 1/0
     granted_value = granted if USE_POSTGRES else (1 if granted else 0)
-    execute_query(query, (
-        datetime.now().isoformat(),
+    # Queued and written in batches by a background thread
+    access_log_buffer.append((
+        datetime.now(timezone.utc),
         user_id,
         role,
         purpose,
@@ -1064,13 +1088,23 @@ def log_access_attempt(
         ip_address
     ))
 
+def parse_stored_time(value: str) -> datetime:
+    """
+    Parse a stored ISO 8601 timestamp as an aware UTC datetime
+    
+    Rows written before timestamps were stored in UTC hold naive local
+    times; those are read as local time and converted.
+    """
+    return datetime.fromisoformat(value).astimezone(timezone.utc)
+
+
 def create_session(user_id: str, role: str) -> dict:
     """Create a new user session"""
     import uuid
     from datetime import timedelta
     
     session_id = str(uuid.uuid4())
-    created_at = datetime.now()
+    created_at = datetime.now(timezone.utc)
     expires_at = created_at + timedelta(hours=8)  # 8 hour sessions
     
     execute_query("""
@@ -1106,7 +1140,7 @@ def verify_session(session_id: str) -> Optional[dict]:
     if not active:
         return None
     
-    if datetime.fromisoformat(expires_at) < datetime.now():
+    if parse_stored_time(expires_at) < datetime.now(timezone.utc):
         return None
     
     return {
@@ -1284,7 +1318,7 @@ async def debug_test_draft(request: dict):
         execute_query("""
             INSERT INTO encounters (encounter_id, patient_id, created_by, created_by_role, created_at, encounter_type, status, notes)
             VALUES (?, ?, ?, ?, ?, ?, 'draft', '')
-        """, (enc_id, patient_id, "debug", "doctor", datetime.now().isoformat(), "test"))
+        """, (enc_id, patient_id, "debug", "doctor", datetime.now(timezone.utc).isoformat(), "test"))
         results["steps"].append({"step": "CREATE_DRAFT", "success": True, "encounter_id": enc_id})
         return {"encounter_id": enc_id, "status": "draft", "reused": False, "debug": results}
     except Exception as e:
@@ -1307,7 +1341,7 @@ async def debug_reset_demo_accounts():
         
         # Now insert fresh accounts
         default_pw = hash_password("demo123")
-        now = datetime.now().isoformat()
+        now = datetime.now(timezone.utc).isoformat()
         demo_accounts = [
             ("doctor_DOC001", "doctor@biotek.health", default_pw, "doctor", "Dr. Sarah Smith", "EMP-DOC-001", "Internal Medicine"),
             ("nurse_NUR001", "nurse@biotek.health", default_pw, "nurse", "Emily Johnson RN", "EMP-NUR-001", "Patient Care"),
@@ -1438,7 +1472,7 @@ async def debug_test_encounter():
         execute_query("""
             INSERT INTO encounters (encounter_id, patient_id, created_by, created_by_role, created_at, encounter_type, status, notes)
             VALUES (?, ?, ?, ?, ?, ?, 'draft', '')
-        """, (test_id, "PAT-DEBUG", "debug", "doctor", datetime.now().isoformat(), "test"))
+        """, (test_id, "PAT-DEBUG", "debug", "doctor", datetime.now(timezone.utc).isoformat(), "test"))
         results["steps"].append({"step": "INSERT", "success": True, "encounter_id": test_id})
     except Exception as e:
         results["steps"].append({"step": "INSERT", "success": False, "error": str(e)})
@@ -1632,13 +1666,13 @@ async def register_patient(request: PatientRegistrationRequest):
             
             if code_result:
                 code_id, expires_at = code_result
-                if datetime.fromisoformat(expires_at) > datetime.now():
+                if parse_stored_time(expires_at) > datetime.now(timezone.utc):
                     # Mark code as used
                     execute_query("""
                         UPDATE verification_codes 
                         SET used = 1, used_at = ?, patient_id = ?
                         WHERE id = ?
-                    """, (datetime.now().isoformat(), patient_id, code_id))
+                    """, (datetime.now(timezone.utc).isoformat(), patient_id, code_id))
                     verified = True
         
         # Insert patient account
@@ -1653,7 +1687,7 @@ async def register_patient(request: PatientRegistrationRequest):
             password_hash,
             mrn_encrypted,
             request.date_of_birth,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             1 if verified else 0,
             verification_token
         ))
@@ -1721,8 +1755,8 @@ async def login_patient(request: PatientLoginRequest):
         
         # Check if account is locked
         if locked_until:
-            lock_time = datetime.fromisoformat(locked_until)
-            if lock_time > datetime.now():
+            lock_time = parse_stored_time(locked_until)
+            if lock_time > datetime.now(timezone.utc):
                 raise HTTPException(status_code=403, detail="Account is locked. Try again later.")
         
         # Verify password
@@ -1735,7 +1769,7 @@ async def login_patient(request: PatientLoginRequest):
             """, (new_failed_attempts, request.patient_id))
             
             if new_failed_attempts >= 5:
-                lock_time = (datetime.now() + timedelta(minutes=30)).isoformat()
+                lock_time = (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat()
                 execute_query("""
                     UPDATE patient_accounts 
                     SET locked_until = ?
@@ -1759,7 +1793,7 @@ async def login_patient(request: PatientLoginRequest):
             UPDATE patient_accounts 
             SET failed_login_attempts = 0, last_login = ?
             WHERE patient_id = ?
-        """, (datetime.now().isoformat(), request.patient_id))
+        """, (datetime.now(timezone.utc).isoformat(), request.patient_id))
         
         # Create session
         session = create_session(request.patient_id, "patient")
@@ -1871,7 +1905,7 @@ async def admin_login(request: AdminLoginRequest, two_factor_token: Optional[str
             UPDATE admin_accounts
             SET last_login = ?
             WHERE admin_id = ?
-        """, (datetime.now().isoformat(), request.admin_id))
+        """, (datetime.now(timezone.utc).isoformat(), request.admin_id))
         
         # Create session
         session = create_session(request.admin_id, "admin")
@@ -1953,7 +1987,7 @@ async def create_staff_account(request: CreateStaffRequest, admin_id: str = Head
             request.full_name,
             request.employee_id,
             request.department,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             admin_id,
             False,  # Not activated yet
             activation_token
@@ -1965,7 +1999,7 @@ async def create_staff_account(request: CreateStaffRequest, admin_id: str = Head
             (timestamp, admin_id, action, user_id, details)
             VALUES (?, ?, ?, ?, ?)
         """, (
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             admin_id,
             "create_account",
             user_id,
@@ -1981,7 +2015,8 @@ async def create_staff_account(request: CreateStaffRequest, admin_id: str = Head
             request.email,
             user_id,
             request.temporary_password,
-            request.role.value
+            request.role.value,
+            background=True
         )
         
         message = f"Staff account created. Activation email sent to {request.email}"
@@ -2044,7 +2079,7 @@ async def login_staff(request: StaffLoginRequest):
             except Exception as sess_err:
                 print(f"Session DB warning, using in-memory: {sess_err}")
                 session_id = f"DEMO-{uuid.uuid4().hex[:16].upper()}"
-                expires_at = (datetime.now() + timedelta(hours=8)).isoformat()
+                expires_at = (datetime.now(timezone.utc) + timedelta(hours=8)).isoformat()
             
             access_token = create_access_token({"sub": request.user_id, "role": role, "email": email})
             role_enum = Role(role)
@@ -2078,8 +2113,8 @@ async def login_staff(request: StaffLoginRequest):
         
         # Check if account is locked
         if locked_until:
-            lock_time = datetime.fromisoformat(locked_until)
-            if lock_time > datetime.now():
+            lock_time = parse_stored_time(locked_until)
+            if lock_time > datetime.now(timezone.utc):
                 raise HTTPException(status_code=403, detail="Account is locked. Try again later.")
         
         # Verify password
@@ -2094,7 +2129,7 @@ async def login_staff(request: StaffLoginRequest):
             
             # Lock account after 5 failed attempts (lock for 30 minutes)
             if new_failed_attempts >= 5:
-                lock_time = (datetime.now() + timedelta(minutes=30)).isoformat()
+                lock_time = (datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat()
                 execute_query("""
                     UPDATE staff_accounts
                     SET locked_until = ?
@@ -2108,7 +2143,7 @@ async def login_staff(request: StaffLoginRequest):
             UPDATE staff_accounts
             SET failed_login_attempts = 0, last_login = ?, activated = true
             WHERE user_id = ?
-        """, (datetime.now().isoformat(), request.user_id))
+        """, (datetime.now(timezone.utc).isoformat(), request.user_id))
         
         # Create session
         session = create_session(request.user_id, role)
@@ -2196,7 +2231,7 @@ async def get_staff_accounts(admin_id: str = Header(..., alias="X-Admin-ID")):
             is_locked = False
             if row[8]:  # locked_until
                 try:
-                    is_locked = datetime.fromisoformat(row[8]) > datetime.now()
+                    is_locked = parse_stored_time(row[8]) > datetime.now(timezone.utc)
                 except:
                     pass
             accounts.append({
@@ -2260,7 +2295,7 @@ async def update_staff_status(
             (timestamp, admin_id, action, user_id, details)
             VALUES (?, ?, ?, ?, ?)
         """, (
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             admin_id,
             "disable_account" if request.disabled else "enable_account",
             request.user_id,
@@ -2301,7 +2336,7 @@ async def request_password_reset(request: PasswordResetRequest):
         
         # Generate reset token
         reset_token = generate_verification_token()
-        expires_at = datetime.now() + timedelta(hours=1)  # 1 hour expiry
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)  # 1 hour expiry
         
         # Store reset token
         execute_query("""
@@ -2312,12 +2347,12 @@ async def request_password_reset(request: PasswordResetRequest):
             reset_token,
             request.email,
             request.user_type,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             expires_at.isoformat()
         ))
         
         # Send password reset email
-        send_password_reset_email(request.email, reset_token, request.user_type)
+        send_password_reset_email(request.email, reset_token, request.user_type, background=True)
         
         return {
             "message": "If this email exists, a reset link has been sent",
@@ -2356,7 +2391,7 @@ async def reset_password(request: PasswordResetConfirm):
         if used:
             raise HTTPException(status_code=400, detail="Reset token has already been used")
         
-        if datetime.fromisoformat(expires_at) < datetime.now():
+        if parse_stored_time(expires_at) < datetime.now(timezone.utc):
             raise HTTPException(status_code=400, detail="Reset token has expired")
         
         # Hash new password
@@ -2387,7 +2422,7 @@ async def reset_password(request: PasswordResetConfirm):
             UPDATE password_reset_tokens
             SET used = 1, used_at = ?
             WHERE token = ?
-        """, (datetime.now().isoformat(), request.token))
+        """, (datetime.now(timezone.utc).isoformat(), request.token))
         
         return {"message": "Password reset successfully"}
         
@@ -2709,7 +2744,7 @@ async def export_audit_log(
             content=csv_data,
             media_type="text/csv",
             headers={
-                "Content-Disposition": f"attachment; filename=biotek_audit_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                "Content-Disposition": f"attachment; filename=biotek_audit_log_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.csv"
             }
         )
     except HTTPException:
@@ -2749,7 +2784,7 @@ async def register_institution(
             request.address,
             request.contact_email,
             request.contact_phone,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             admin_id
         ))
         
@@ -2832,8 +2867,8 @@ async def request_patient_data(request: DataExchangeRequest):
             json.dumps(request.categories),
             ExchangeStatus.PENDING.value,
             request.requested_by,
-            datetime.now().isoformat(),
-            (datetime.now() + timedelta(days=7)).isoformat()  # 7 days to respond
+            datetime.now(timezone.utc).isoformat(),
+            (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()  # 7 days to respond
         ))
         
         # Log the request
@@ -2846,7 +2881,7 @@ async def request_patient_data(request: DataExchangeRequest):
             "request_created",
             f"Data requested by {request.requesting_institution} for patient {request.patient_id}",
             request.requested_by,
-            datetime.now().isoformat()
+            datetime.now(timezone.utc).isoformat()
         ))
         
         # In production: Notify patient and staff about request
@@ -2933,7 +2968,7 @@ async def patient_consent_to_exchange(request: PatientConsentDecision):
                 UPDATE data_exchange_requests
                 SET status = ?, patient_consent_status = 'approved', patient_consent_at = ?
                 WHERE exchange_id = ?
-            """, (new_status, datetime.now().isoformat(), request.exchange_id))
+            """, (new_status, datetime.now(timezone.utc).isoformat(), request.exchange_id))
             
             # Log approval
             execute_query("""
@@ -2945,7 +2980,7 @@ async def patient_consent_to_exchange(request: PatientConsentDecision):
                 "patient_approved",
                 "Patient consented to data sharing",
                 request.patient_id,
-                datetime.now().isoformat()
+                datetime.now(timezone.utc).isoformat()
             ))
             
             message = "Consent granted. Data will be shared."
@@ -2956,7 +2991,7 @@ async def patient_consent_to_exchange(request: PatientConsentDecision):
                 SET status = ?, patient_consent_status = 'denied', 
                     patient_consent_at = ?, denial_reason = ?
                 WHERE exchange_id = ?
-            """, (new_status, datetime.now().isoformat(), request.denial_reason, request.exchange_id))
+            """, (new_status, datetime.now(timezone.utc).isoformat(), request.denial_reason, request.exchange_id))
             
             # Log denial
             execute_query("""
@@ -2968,7 +3003,7 @@ async def patient_consent_to_exchange(request: PatientConsentDecision):
                 "patient_denied",
                 f"Patient denied data sharing. Reason: {request.denial_reason}",
                 request.patient_id,
-                datetime.now().isoformat()
+                datetime.now(timezone.utc).isoformat()
             ))
             
             message = "Consent denied. Data will not be shared."
@@ -2985,6 +3020,20 @@ async def patient_consent_to_exchange(request: PatientConsentDecision):
         raise HTTPException(status_code=500, detail=f"Failed to process consent: {str(e)}")
 
 
+def get_exchange_patient_data(patient_id: str) -> dict:
+    """Patient record to send in an exchange (simulated - in production, fetch from database)"""
+    return {
+        "patient_id": patient_id,
+        "name": "John Doe",  # Fetch from DB
+        "dob": "1980-01-01",
+        "gender": "M",
+        "diagnoses": ["Hypertension", "Type 2 Diabetes"],
+        "medications": ["Metformin", "Lisinopril"],
+        "lab_results": [{"test": "HbA1c", "value": 7.2, "date": "2025-11-01"}],
+        "predictions": []  # Fetch from predictions table
+    }
+
+
 @app.post("/exchange/send-data")
 async def send_patient_data(request: SendDataRequest):
     """
@@ -3012,20 +3061,11 @@ async def send_patient_data(request: SendDataRequest):
         if status != ExchangeStatus.APPROVED.value:
             raise HTTPException(status_code=403, detail="Patient consent required before sending data")
         
-        # Get patient data (simulated - in production, fetch from database)
-        patient_data = {
-            "patient_id": patient_id,
-            "name": "John Doe",  # Fetch from DB
-            "dob": "1980-01-01",
-            "gender": "M",
-            "diagnoses": ["Hypertension", "Type 2 Diabetes"],
-            "medications": ["Metformin", "Lisinopril"],
-            "lab_results": [{"test": "HbA1c", "value": 7.2, "date": "2025-11-01"}],
-            "predictions": []  # Fetch from predictions table
-        }
+        # Get patient data
+        patient_data = get_exchange_patient_data(patient_id)
         
         # Parse categories
-        categories = [DataCategory(cat) for cat in json.loads(categories_json)]
+        categories = parse_categories(json.loads(categories_json))
         
         # Create exchange package
         package = create_exchange_package(
@@ -3048,8 +3088,8 @@ async def send_patient_data(request: SendDataRequest):
         """, (
             ExchangeStatus.SENT.value,
             request.admin_id,
-            datetime.now().isoformat(),
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             request.exchange_id
         ))
         
@@ -3063,7 +3103,7 @@ async def send_patient_data(request: SendDataRequest):
             "data_sent",
             f"Data sent to {requesting_inst}. Categories: {categories_json}",
             request.admin_id,
-            datetime.now().isoformat()
+            datetime.now(timezone.utc).isoformat()
         ))
         
         # Log to access_log for HIPAA compliance
@@ -3093,6 +3133,111 @@ async def send_patient_data(request: SendDataRequest):
         raise HTTPException(status_code=500, detail=f"Failed to send data: {str(e)}")
 
 
+@app.post("/exchange/send-data/batch")
+async def send_patient_data_batch(request: SendBatchDataRequest):
+    """
+    Send several approved exchanges to one institution in a single package
+    
+    All exchanges must be approved and share the requesting institution,
+    purpose and categories; the records are serialized and encrypted once
+    (the recipient opens them with open_exchange_packages)
+    """
+    try:
+        # Verify admin
+        if not execute_query("SELECT admin_id FROM admin_accounts WHERE admin_id = ?", (request.admin_id,), fetch='one'):
+            raise HTTPException(status_code=403, detail="Unauthorized: Admin access required")
+        
+        exchange_ids = list(dict.fromkeys(request.exchange_ids))
+        if not exchange_ids:
+            raise HTTPException(status_code=400, detail="No exchanges to send")
+        
+        # Get all exchange requests in one query
+        rows = execute_query(f"""
+            SELECT exchange_id, patient_id, requesting_institution, purpose, categories, status
+            FROM data_exchange_requests
+            WHERE exchange_id IN ({", ".join("?" * len(exchange_ids))})
+        """, tuple(exchange_ids), fetch='all') or []
+        
+        found = {row[0] for row in rows}
+        missing = [exchange_id for exchange_id in exchange_ids if exchange_id not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Exchange requests not found: {', '.join(missing)}")
+        
+        # Verify every patient has consented
+        unapproved = [row[0] for row in rows if row[5] != ExchangeStatus.APPROVED.value]
+        if unapproved:
+            raise HTTPException(status_code=403, detail=f"Patient consent required before sending: {', '.join(unapproved)}")
+        
+        # One package = one recipient, purpose and category set
+        if len({(row[2], row[3], row[4]) for row in rows}) > 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Batched exchanges must share requesting institution, purpose and categories"
+            )
+        
+        _, _, requesting_inst, purpose, categories_json, _ = rows[0]
+        categories = parse_categories(json.loads(categories_json))
+        
+        # Create and encrypt the batch package once
+        batch_id = create_exchange_id()
+        package = create_exchange_packages(
+            [get_exchange_patient_data(row[1]) for row in rows],
+            batch_id,
+            "BIOTEK-MAIN",
+            requesting_inst,
+            purpose,
+            categories
+        )
+        encrypted_package = encrypt_data_for_exchange(package)
+        
+        # Update exchange requests and log the sends
+        now = datetime.now(timezone.utc).isoformat()
+        execute_many("""
+            UPDATE data_exchange_requests
+            SET status = ?, approved_by = ?, approved_at = ?, sent_at = ?
+            WHERE exchange_id = ?
+        """, [(ExchangeStatus.SENT.value, request.admin_id, now, now, row[0]) for row in rows])
+        execute_many("""
+            INSERT INTO data_exchange_logs
+            (exchange_id, event_type, details, user_id, timestamp)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (row[0], "data_sent",
+             f"Data sent to {requesting_inst} in batch {batch_id}. Categories: {categories_json}",
+             request.admin_id, now)
+            for row in rows
+        ])
+        
+        # Log to access_log for HIPAA compliance
+        for row in rows:
+            log_access_attempt(
+                user_id=request.admin_id,
+                role="admin",
+                purpose=purpose,
+                data_type="data_exchange",
+                patient_id=row[1],
+                granted=True,
+                reason=f"Data sent to {requesting_inst} via exchange {row[0]} (batch {batch_id})"
+            )
+        
+        # In production: Actually send encrypted_package to recipient
+        
+        return {
+            "batch_id": batch_id,
+            "exchange_ids": [row[0] for row in rows],
+            "status": "sent",
+            "message": f"{len(rows)} patient records sent to {requesting_inst}",
+            "encrypted_size": len(encrypted_package),
+            "expires_at": package["metadata"]["expires_at"],
+            "categories_sent": json.loads(categories_json)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to send data: {str(e)}")
+
+
 @app.get("/exchange/audit-trail/{exchange_id}")
 async def get_exchange_audit_trail(exchange_id: str):
     """
@@ -3187,7 +3332,7 @@ async def download_patient_records(request: PatientDataDownloadRequest):
             request.patient_id,
             "download",
             request.format,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             "fulfilled",
             request.delivery_method
         ))
@@ -3270,7 +3415,7 @@ async def create_patient_share_link(request: CreateShareLinkRequest):
             request.patient_id,
             "share_link",
             request.format,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             "active",
             "link"
         ))
@@ -3318,7 +3463,7 @@ async def access_shared_data(share_token: str):
         if revoked:
             raise HTTPException(status_code=403, detail="Share link has been revoked")
         
-        if datetime.fromisoformat(expires_at) < datetime.now():
+        if parse_stored_time(expires_at) < datetime.now(timezone.utc):
             raise HTTPException(status_code=403, detail="Share link has expired")
         
         if (access_count or 0) >= (max_accesses or 1):
@@ -3424,7 +3569,7 @@ async def get_patient_share_links(patient_id: str):
                 "revoked": bool(row[5]) if row[5] is not None else False,
                 "format": row[6],
                 "recipient_email": row[7],
-                "status": "revoked" if row[5] else "expired" if datetime.fromisoformat(row[2]) < datetime.now() else "active"
+                "status": "revoked" if row[5] else "expired" if parse_stored_time(row[2]) < datetime.now(timezone.utc) else "active"
             })
         
         return {"share_links": shares, "total": len(shares)}
@@ -3483,10 +3628,12 @@ async def run_federated_training(
             raise HTTPException(status_code=403, detail="Unauthorized")
         
         # Simulate federated training
-        coordinator, summary = simulate_federated_training(num_rounds=num_rounds)
+        coordinator, summary = simulate_federated_training(
+            num_rounds=num_rounds, verbose=False, parallel_training=False
+        )
         
         # Evaluate vs centralized
-        comparison = evaluate_federated_vs_centralized(coordinator)
+        comparison = evaluate_federated_vs_centralized(coordinator, verbose=False)
         
         return {
             "message": "Federated training completed successfully",
@@ -3527,7 +3674,7 @@ async def calculate_prs(request: GenomicDataRequest):
     PRECISION MEDICINE: Separate genetic vs lifestyle risk factors
     """
     try:
-        calculator = GenomicRiskCalculator()
+        calculator = PRS_CALCULATOR
         
         # Calculate PRS
         prs_result = calculator.calculate_prs(request.genotypes)
@@ -3557,8 +3704,8 @@ async def calculate_combined_risk(request: CombinedRiskRequest):
     """
     try:
         # Calculate PRS
-        calculator = GenomicRiskCalculator()
-        prs_result = calculator.calculate_prs(request.genotypes)
+        calculator = PRS_CALCULATOR
+        prs_result = calculator.calculate_prs(request.genotypes, detailed=False)
         
         # Calculate clinical risk using existing model
         clinical_features = np.array([[
@@ -3618,11 +3765,11 @@ async def get_sample_genotypes(risk_level: str = "average"):
         if risk_level not in ['low', 'average', 'high']:
             raise HTTPException(status_code=400, detail="risk_level must be 'low', 'average', or 'high'")
         
-        calculator = GenomicRiskCalculator()
+        calculator = PRS_CALCULATOR
         genotypes = calculator.generate_sample_genotypes(risk_level=risk_level)
         
         # Calculate PRS for these genotypes
-        prs_result = calculator.calculate_prs(genotypes)
+        prs_result = calculator.calculate_prs(genotypes, detailed=False)
         
         return {
             "risk_level": risk_level,
@@ -3724,18 +3871,10 @@ async def model_info():
     }
 
 
-@app.get("/model/disease-metadata")
-async def get_disease_metadata_endpoint():
-    """
-    Get disease metadata including applicability gates and feature provenance.
-    
-    Returns:
-        - Per-disease applicability (sex, age restrictions)
-        - Feature lists used by each model
-        - Dataset provenance (real vs synthetic)
-        - Model quality metrics
-    """
-    return {
+@lru_cache(maxsize=1)
+def _disease_metadata_json() -> bytes:
+    """The (static) disease metadata response, serialized once"""
+    payload = {
         "diseases": get_all_metadata(),
         "total_diseases": len(DISEASE_METADATA),
         "feature_sets": {
@@ -3749,6 +3888,24 @@ async def get_disease_metadata_endpoint():
             "sex_stratified": "Whether training data had real sex distribution"
         }
     }
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+@app.get("/model/disease-metadata")
+async def get_disease_metadata_endpoint():
+    """
+    Get disease metadata including applicability gates and feature provenance.
+    
+    Returns:
+        - Per-disease applicability (sex, age restrictions)
+        - Feature lists used by each model
+        - Dataset provenance (real vs synthetic)
+        - Model quality metrics
+    """
+    # Pre-serialized bytes skip FastAPI's jsonable_encoder + json.dumps
+    return Response(content=_disease_metadata_json(), media_type="application/json")
 
 
 @app.get("/model/check-applicability/{disease_id}")
@@ -3764,7 +3921,8 @@ async def check_disease_applicability(disease_id: str, sex: int, age: int):
     Returns:
         Applicability status with reason if not applicable
     """
-    result = check_applicability(disease_id, sex, age)
+    # Copy: the applicable result is shared and metadata is replaced below
+    result = dict(check_applicability(disease_id, sex, age))
     
     # Convert metadata to dict for JSON serialization
     if result.get("metadata"):
@@ -3853,7 +4011,7 @@ async def predict_risk(patient: PatientInput):
             confidence=float(max(proba[0])),  # Use max probability from model
             feature_importance=feature_importance,
             model_version=model_metadata['version'],
-            timestamp=datetime.now().isoformat(),
+            timestamp=datetime.now(timezone.utc).isoformat(),
             used_genetics=patient.use_genetics
         )
         
@@ -4696,7 +4854,7 @@ async def predict_multi_disease(
     )
     
     return {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "predictions": predictions,
         "summary": {
             "total_diseases_analyzed": 12,
@@ -4723,22 +4881,24 @@ async def predict_multi_disease(
     }
 
 
+# Written once per risk prediction
+PREDICTION_INSERT_QUERY = register_hot_query("""
+    INSERT INTO predictions 
+    (timestamp, patient_id, input_data, risk_score, risk_category, 
+     used_genetics, consent_id, model_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+""")
+
+
 def log_prediction(patient_id: str, input_data: str, prediction: float, 
                    risk_category: str, used_genetics: bool, consent_id: Optional[str],
                    model_version: str):
     """Log prediction to audit database (PostgreSQL or SQLite)"""
     try:
-        ph = get_placeholder()
-        query = f"""
-            INSERT INTO predictions 
-            (timestamp, patient_id, input_data, risk_score, risk_category, 
-             used_genetics, consent_id, model_version)
-            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-        """
         # PostgreSQL needs actual boolean, SQLite uses 1/0
         genetics_value = used_genetics if USE_POSTGRES else (1 if used_genetics else 0)
-        execute_query(query, (
-            datetime.now().isoformat(),
+        execute_query(PREDICTION_INSERT_QUERY, (
+            datetime.now(timezone.utc).isoformat(),
             patient_id,
             input_data,
             prediction,
@@ -4761,6 +4921,7 @@ async def get_audit_logs(limit: int = 50, patient_id: Optional[str] = None):
     """
     try:
         ph = get_placeholder()
+        access_log_buffer.flush()
         
         # Query access_log for events (this is the proper audit trail)
         if patient_id:
@@ -4856,6 +5017,7 @@ async def get_access_logs(limit: int = 50, user_id: Optional[str] = None, role:
     """
     try:
         ph = get_placeholder()
+        access_log_buffer.flush()
         
         # Build query with proper placeholders
         base_query = """
@@ -5238,7 +5400,7 @@ async def generate_patient_report(request: ReportRequest):
     
     return ReportResponse(
         report=report_text,
-        generated_at=datetime.now().isoformat(),
+        generated_at=datetime.now(timezone.utc).isoformat(),
         model_used="GLM-4.5V"
     )
 
@@ -5531,7 +5693,7 @@ Review the Risk Factor Impact Analysis for prioritized interventions. Consider s
         return {
             'question': question,
             'answer': answer,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now(timezone.utc).isoformat()
         }
             
     except Exception as e:
@@ -5539,7 +5701,7 @@ Review the Risk Factor Impact Analysis for prioritized interventions. Consider s
         return {
             'question': request.get('question', ''),
             'answer': f"⚠️ Unable to process request: {str(e)[:100]}. Please try again or rephrase your question.",
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now(timezone.utc).isoformat()
         }
 
 
@@ -6130,7 +6292,7 @@ Use the exact values provided."""
             'treatment_protocol': protocol,
             'confidence': confidence,
             'based_on_patients': '12,451 similar patients from clinical trials',
-            'generated_at': datetime.now().isoformat()
+            'generated_at': datetime.now(timezone.utc).isoformat()
         }
             
     except Exception as e:
@@ -6138,7 +6300,7 @@ Use the exact values provided."""
             'treatment_protocol': f"⚠️ Unable to generate protocol: {str(e)[:100]}",
             'confidence': 0,
             'based_on_patients': 'N/A',
-            'generated_at': datetime.now().isoformat()
+            'generated_at': datetime.now(timezone.utc).isoformat()
         }
 
 
@@ -6317,7 +6479,7 @@ async def progression_simulation(
                 'adjusted': round(adjusted_rate * 100, 1),
                 'with_intervention': round(intervention_rate * 100, 1)
             },
-            'generated_at': datetime.now().isoformat()
+            'generated_at': datetime.now(timezone.utc).isoformat()
         }
         
     except Exception as e:
@@ -6406,6 +6568,27 @@ from fhir_integration import (
 )
 
 
+def _cds_json_response(payload: Dict) -> Response:
+    """Serialize a CDS Hooks payload with orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return Response(
+                content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                media_type="application/json"
+            )
+        except TypeError:
+            pass  # Unsupported type - let FastAPI's encoder handle it
+    return JSONResponse(jsonable_encoder(payload))
+
+
+@lru_cache(maxsize=1)
+def _cds_discovery_json() -> bytes:
+    """CDS_HOOKS_DISCOVERY is static, so serialize it once"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(CDS_HOOKS_DISCOVERY)
+    return json.dumps(CDS_HOOKS_DISCOVERY).encode()
+
+
 class FHIRBundleInput(BaseModel):
     """FHIR Bundle containing patient data"""
     resourceType: str = "Bundle"
@@ -6418,15 +6601,24 @@ async def cds_hooks_discovery():
     CDS Hooks Discovery Endpoint
     Returns available CDS services for EHR integration
     """
-    return CDS_HOOKS_DISCOVERY
+    return Response(content=_cds_discovery_json(), media_type="application/json")
 
 
 @app.post("/cds-services/biotek-risk-assessment")
-async def cds_hooks_risk_assessment(request: Dict):
+async def cds_hooks_risk_assessment(http_request: Request):
     """
     CDS Hooks Service Endpoint
     Called by EHR when viewing a patient to provide risk cards
     """
+    # Parse the hook request body directly (orjson when available)
+    body = await http_request.body()
+    try:
+        request = orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be valid JSON")
+    if not isinstance(request, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    
     # Extract prefetch data
     prefetch = request.get("prefetch", {})
     context = request.get("context", {})
@@ -6452,7 +6644,7 @@ async def cds_hooks_risk_assessment(request: Dict):
         missing = [f for f in required if f not in api_input]
         
         if missing:
-            return {
+            return _cds_json_response({
                 "cards": [{
                     "uuid": f"biotek-error-{patient_id}",
                     "summary": "⚠️ Insufficient data for risk assessment",
@@ -6460,7 +6652,7 @@ async def cds_hooks_risk_assessment(request: Dict):
                     "indicator": "info",
                     "source": {"label": "BioTeK Risk Predictor"}
                 }]
-            }
+            })
         
         # Create patient input and get predictions
         patient = MultiDiseaseInput(**api_input)
@@ -6478,10 +6670,10 @@ async def cds_hooks_risk_assessment(request: Dict):
             "data_quality": data_quality
         }
         
-        return create_cds_response(predictions, patient_id)
+        return _cds_json_response(create_cds_response(predictions, patient_id))
         
     except Exception as e:
-        return {
+        return _cds_json_response({
             "cards": [{
                 "uuid": f"biotek-error-{patient_id}",
                 "summary": "Error processing patient data",
@@ -6489,7 +6681,7 @@ async def cds_hooks_risk_assessment(request: Dict):
                 "indicator": "info",
                 "source": {"label": "BioTeK Risk Predictor"}
             }]
-        }
+        })
 
 
 @app.post("/fhir/predict")
@@ -6718,14 +6910,14 @@ async def save_chat_history(request: SaveChatRequest):
         if existing:
             execute_query(
                 "UPDATE chat_history SET messages = ?, updated_at = ? WHERE session_id = ? AND patient_id = ?",
-                (json.dumps([msg.dict() for msg in request.messages]), datetime.now().isoformat(), 
+                (json.dumps([msg.dict() for msg in request.messages]), datetime.now(timezone.utc).isoformat(), 
                  request.session_id or 'default', request.patient_id)
             )
         else:
             execute_query(
                 "INSERT INTO chat_history (session_id, patient_id, messages, updated_at) VALUES (?, ?, ?, ?)",
                 (request.session_id or 'default', request.patient_id, 
-                 json.dumps([msg.dict() for msg in request.messages]), datetime.now().isoformat())
+                 json.dumps([msg.dict() for msg in request.messages]), datetime.now(timezone.utc).isoformat())
             )
     except Exception as e:
         print(f"Failed to save chat to DB: {e}")
@@ -6823,6 +7015,26 @@ class SavePatientDataRequest(BaseModel):
     user_role: str
 
 
+# Record existence check used on every clinical data save/delete
+PATIENT_RECORD_EXISTS_QUERY = register_hot_query(
+    "SELECT patient_id FROM patient_records WHERE patient_id = ?"
+)
+
+# Patient lookup used every time a chart is opened
+PATIENT_RECORD_LOAD_QUERY = register_hot_query("""
+    SELECT age, sex, bmi, bp_systolic, bp_diastolic,
+           total_cholesterol, hba1c, ldl, extras,
+           created_at, updated_at, updated_by
+    FROM patient_records WHERE patient_id = ?
+""")
+
+# Sparse clinical values stored in the patient_records.extras JSONB column
+PATIENT_RECORD_EXTRAS = (
+    "hdl", "triglycerides", "egfr", "smoking_pack_years", "exercise_hours_weekly",
+    "has_diabetes", "on_bp_medication", "family_history_score"
+)
+
+
 @app.post("/patient/save-clinical-data")
 async def save_patient_clinical_data(request: SavePatientDataRequest):
     """
@@ -6832,11 +7044,17 @@ async def save_patient_clinical_data(request: SavePatientDataRequest):
     - Requires user authentication
     """
     try:
-        now = datetime.now().isoformat()
+        now = datetime.now(timezone.utc)
         data = request.patient_data
         
+        # Only non-null sparse values are stored (merged over existing ones on update)
+        extras = {
+            field: getattr(data, field) for field in PATIENT_RECORD_EXTRAS
+            if getattr(data, field) is not None
+        }
+        
         # Check if patient exists
-        exists = execute_query("SELECT patient_id FROM patient_records WHERE patient_id = ?", (data.patient_id,), fetch='one')
+        exists = execute_query(PATIENT_RECORD_EXISTS_QUERY, (data.patient_id,), fetch='one')
         
         if exists:
             # Update existing record
@@ -6849,25 +7067,16 @@ async def save_patient_clinical_data(request: SavePatientDataRequest):
                     bp_systolic = COALESCE(?, bp_systolic),
                     bp_diastolic = COALESCE(?, bp_diastolic),
                     total_cholesterol = COALESCE(?, total_cholesterol),
-                    hdl = COALESCE(?, hdl),
-                    ldl = COALESCE(?, ldl),
-                    triglycerides = COALESCE(?, triglycerides),
                     hba1c = COALESCE(?, hba1c),
-                    egfr = COALESCE(?, egfr),
-                    smoking_pack_years = COALESCE(?, smoking_pack_years),
-                    exercise_hours_weekly = COALESCE(?, exercise_hours_weekly),
-                    has_diabetes = COALESCE(?, has_diabetes),
-                    on_bp_medication = COALESCE(?, on_bp_medication),
-                    family_history_score = COALESCE(?, family_history_score)
+                    ldl = COALESCE(?, ldl),
+                    extras = extras || CAST(? AS JSONB)
                 WHERE patient_id = ?
             """, (
                 now, request.user_id,
                 data.age, data.sex, data.bmi,
                 data.bp_systolic, data.bp_diastolic,
-                data.total_cholesterol, data.hdl, data.ldl, data.triglycerides,
-                data.hba1c, data.egfr,
-                data.smoking_pack_years, data.exercise_hours_weekly,
-                data.has_diabetes, data.on_bp_medication, data.family_history_score,
+                data.total_cholesterol, data.hba1c, data.ldl,
+                json.dumps(extras),
                 data.patient_id
             ))
             action = "updated"
@@ -6877,32 +7086,25 @@ async def save_patient_clinical_data(request: SavePatientDataRequest):
                 INSERT INTO patient_records (
                     patient_id, created_at, updated_at, updated_by,
                     age, sex, bmi, bp_systolic, bp_diastolic,
-                    total_cholesterol, hdl, ldl, triglycerides,
-                    hba1c, egfr, smoking_pack_years, exercise_hours_weekly,
-                    has_diabetes, on_bp_medication, family_history_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    total_cholesterol, hba1c, ldl, extras
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(? AS JSONB))
             """, (
                 data.patient_id, now, now, request.user_id,
                 data.age, data.sex, data.bmi,
                 data.bp_systolic, data.bp_diastolic,
-                data.total_cholesterol, data.hdl, data.ldl, data.triglycerides,
-                data.hba1c, data.egfr,
-                data.smoking_pack_years, data.exercise_hours_weekly,
-                data.has_diabetes, data.on_bp_medication, data.family_history_score
+                data.total_cholesterol, data.hba1c, data.ldl,
+                json.dumps(extras)
             ))
             action = "created"
         
         # Audit log
-        execute_query("""
-            INSERT INTO patient_data_audit (timestamp, patient_id, action, user_id, user_role, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (now, data.patient_id, action, request.user_id, request.user_role, f"Clinical data {action}"))
+        patient_audit_buffer.append((now, data.patient_id, action, request.user_id, request.user_role, f"Clinical data {action}"))
         
         return {
             "status": "success",
             "action": action,
             "patient_id": data.patient_id,
-            "timestamp": now
+            "timestamp": now.isoformat()
         }
         
     except Exception as e:
@@ -6923,20 +7125,10 @@ async def get_patient_clinical_data(
     """
     try:
         # Get patient data
-        row = execute_query("""
-            SELECT age, sex, bmi, bp_systolic, bp_diastolic,
-                   total_cholesterol, hdl, ldl, triglycerides,
-                   hba1c, egfr, smoking_pack_years, exercise_hours_weekly,
-                   has_diabetes, on_bp_medication, family_history_score,
-                   created_at, updated_at, updated_by
-            FROM patient_records WHERE patient_id = ?
-        """, (patient_id,), fetch='one')
+        row = execute_query(PATIENT_RECORD_LOAD_QUERY, (patient_id,), fetch='one')
         
         # Audit log (even for not found - shows intent)
-        execute_query("""
-            INSERT INTO patient_data_audit (timestamp, patient_id, action, user_id, user_role, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (datetime.now().isoformat(), patient_id, "viewed", user_id, user_role, 
+        patient_audit_buffer.append((datetime.now(timezone.utc), patient_id, "viewed", user_id, user_role, 
               "Data loaded" if row else "Patient not found"))
         
         if not row:
@@ -6946,6 +7138,10 @@ async def get_patient_clinical_data(
                 "message": "No existing data. Manual entry required."
             }
         
+        extras = row[8] or {}
+        if isinstance(extras, str):
+            extras = json.loads(extras)
+        
         return {
             "found": True,
             "patient_id": patient_id,
@@ -6956,21 +7152,14 @@ async def get_patient_clinical_data(
                 "bp_systolic": row[3],
                 "bp_diastolic": row[4],
                 "total_cholesterol": row[5],
-                "hdl": row[6],
+                "hba1c": row[6],
                 "ldl": row[7],
-                "triglycerides": row[8],
-                "hba1c": row[9],
-                "egfr": row[10],
-                "smoking_pack_years": row[11],
-                "exercise_hours_weekly": row[12],
-                "has_diabetes": row[13],
-                "on_bp_medication": row[14],
-                "family_history_score": row[15]
+                **{field: extras.get(field) for field in PATIENT_RECORD_EXTRAS}
             },
             "metadata": {
-                "created_at": row[16],
-                "updated_at": row[17],
-                "updated_by": row[18]
+                "created_at": row[9],
+                "updated_at": row[10],
+                "updated_by": row[11]
             }
         }
         
@@ -6997,22 +7186,19 @@ async def delete_patient_clinical_data(
             raise HTTPException(status_code=403, detail="Only patients or admins can delete patient data")
         
         # Check if exists
-        if not execute_query("SELECT patient_id FROM patient_records WHERE patient_id = ?", (patient_id,), fetch='one'):
+        if not execute_query(PATIENT_RECORD_EXISTS_QUERY, (patient_id,), fetch='one'):
             raise HTTPException(status_code=404, detail="Patient record not found")
         
         # Delete the record
         execute_query("DELETE FROM patient_records WHERE patient_id = ?", (patient_id,))
         
         # Audit log (critical for compliance)
-        execute_query("""
-            INSERT INTO patient_data_audit (timestamp, patient_id, action, user_id, user_role, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (datetime.now().isoformat(), patient_id, "deleted", user_id, user_role, f"Reason: {reason}"))
+        patient_audit_buffer.append((datetime.now(timezone.utc), patient_id, "deleted", user_id, user_role, f"Reason: {reason}"))
         
         return {
             "status": "deleted",
             "patient_id": patient_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "message": "Patient data permanently deleted per GDPR Article 17"
         }
         
@@ -7034,13 +7220,18 @@ async def get_patient_data_audit(
     - Patients can see who accessed their data
     """
     try:
+        # Make sure queued entries are visible in the trail
+        patient_audit_buffer.flush()
+        
+        # patient_data_audit is PostgreSQL-only; local SQLite has no trail
         rows = execute_query("""
             SELECT timestamp, action, user_id, user_role, details
             FROM patient_data_audit
             WHERE patient_id = ?
             ORDER BY timestamp DESC
             LIMIT 100
-        """, (patient_id,), fetch='all') or []
+        """, (patient_id,), fetch='all') if patient_audit_buffer.enabled else None
+        rows = rows or []
         
         return {
             "patient_id": patient_id,
@@ -7134,7 +7325,7 @@ async def save_patient_prediction_results(
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph})
             """
         
-        execute_query(query, (patient_id, datetime.now().isoformat(), created_by, visibility, prediction_json, patient_summary_json))
+        execute_query(query, (patient_id, datetime.now(timezone.utc).isoformat(), created_by, visibility, prediction_json, patient_summary_json))
         
         return {"status": "saved", "patient_id": patient_id, "visibility": visibility}
         
@@ -7295,7 +7486,7 @@ async def save_patient_variant_result(
         """
         execute_query(query, (
             patient_id,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             user_id or "doctor_session",
             result_data.get('variant', ''),
             result_data.get('gene', ''),
@@ -7336,7 +7527,7 @@ async def save_patient_imaging_result(
         """
         execute_query(query, (
             patient_id,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             user_id or "doctor_session",
             result_data.get('image_type', 'unknown'),
             result_data.get('finding_summary', ''),
@@ -7375,7 +7566,7 @@ async def save_patient_treatment(
         """
         execute_query(query, (
             patient_id,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             user_id or "doctor_session",
             result_data.get('treatment_type', 'general'),
             result_data.get('protocol_summary', ''),
@@ -7414,7 +7605,7 @@ async def save_patient_clinical_reasoning(
         """
         execute_query(query, (
             patient_id,
-            datetime.now().isoformat(),
+            datetime.now(timezone.utc).isoformat(),
             user_id or "doctor_session",
             result_data.get('assessment', '')[:200],
             json.dumps(result_data)
@@ -7614,9 +7805,9 @@ async def initiate_data_exchange(
                 ",".join(categories),
                 "SENT",
                 initiated_by or user_id,
-                datetime.now().isoformat(),
+                datetime.now(timezone.utc).isoformat(),
                 "CONFIRMED",
-                datetime.now().isoformat()
+                datetime.now(timezone.utc).isoformat()
             ))
         except Exception as db_error:
             print(f"Note: Exchange logged but DB insert failed: {db_error}")
@@ -7629,7 +7820,7 @@ async def initiate_data_exchange(
             "recipient": recipient_institution,
             "categories": categories,
             "purpose": purpose,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "audit_logged": True,
             "encrypted": True,
             "message": "Data exchange initiated successfully. Full audit trail created."
@@ -7757,8 +7948,8 @@ async def create_patient_receptionist(
             with get_db_cursor(conn) as cursor:
                 cursor.execute(query, (
                     patient_id,
-                    datetime.now().isoformat(),
-                    datetime.now().isoformat(),
+                    datetime.now(timezone.utc).isoformat(),
+                    datetime.now(timezone.utc).isoformat(),
                     user_id
                 ))
                 conn.commit()
@@ -7783,7 +7974,7 @@ async def get_appointments(
                 "id": "APT-001",
                 "patient_id": "PAT-0001",
                 "patient_name": "John D.",
-                "date": datetime.now().strftime("%Y-%m-%d"),
+                "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
                 "time": "09:00",
                 "type": "checkup",
                 "status": "scheduled",
@@ -7793,7 +7984,7 @@ async def get_appointments(
                 "id": "APT-002",
                 "patient_id": "PAT-0002",
                 "patient_name": "Sarah M.",
-                "date": datetime.now().strftime("%Y-%m-%d"),
+                "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
                 "time": "10:30",
                 "type": "followup",
                 "status": "confirmed",
@@ -8022,9 +8213,9 @@ async def get_patient_vitals_for_nurse(
     return {
         "patient_id": patient_id,
         "vitals": [
-            {"timestamp": datetime.now().isoformat(), "bp_systolic": 128, "bp_diastolic": 82, "heart_rate": 72, "temperature": 98.6, "weight": 175, "respiratory_rate": 16, "oxygen_saturation": 98},
-            {"timestamp": (datetime.now() - timedelta(hours=4)).isoformat(), "bp_systolic": 132, "bp_diastolic": 85, "heart_rate": 78, "temperature": 98.8, "weight": 175, "respiratory_rate": 18, "oxygen_saturation": 97},
-            {"timestamp": (datetime.now() - timedelta(hours=8)).isoformat(), "bp_systolic": 125, "bp_diastolic": 80, "heart_rate": 70, "temperature": 98.4, "weight": 175, "respiratory_rate": 15, "oxygen_saturation": 99},
+            {"timestamp": datetime.now(timezone.utc).isoformat(), "bp_systolic": 128, "bp_diastolic": 82, "heart_rate": 72, "temperature": 98.6, "weight": 175, "respiratory_rate": 16, "oxygen_saturation": 98},
+            {"timestamp": (datetime.now(timezone.utc) - timedelta(hours=4)).isoformat(), "bp_systolic": 132, "bp_diastolic": 85, "heart_rate": 78, "temperature": 98.8, "weight": 175, "respiratory_rate": 18, "oxygen_saturation": 97},
+            {"timestamp": (datetime.now(timezone.utc) - timedelta(hours=8)).isoformat(), "bp_systolic": 125, "bp_diastolic": 80, "heart_rate": 70, "temperature": 98.4, "weight": 175, "respiratory_rate": 15, "oxygen_saturation": 99},
         ]
     }
 
@@ -8052,11 +8243,11 @@ async def get_patient_labs_for_nurse(
     return {
         "patient_id": patient_id,
         "labs": [
-            {"test_name": "Glucose", "value": "105", "unit": "mg/dL", "reference_range": "70-100", "status": "high", "timestamp": datetime.now().isoformat()},
-            {"test_name": "Hemoglobin", "value": "14.2", "unit": "g/dL", "reference_range": "12-17", "status": "normal", "timestamp": datetime.now().isoformat()},
-            {"test_name": "WBC", "value": "7.5", "unit": "K/uL", "reference_range": "4.5-11", "status": "normal", "timestamp": datetime.now().isoformat()},
-            {"test_name": "Creatinine", "value": "1.1", "unit": "mg/dL", "reference_range": "0.7-1.3", "status": "normal", "timestamp": datetime.now().isoformat()},
-            {"test_name": "Potassium", "value": "5.2", "unit": "mEq/L", "reference_range": "3.5-5.0", "status": "high", "timestamp": datetime.now().isoformat()},
+            {"test_name": "Glucose", "value": "105", "unit": "mg/dL", "reference_range": "70-100", "status": "high", "timestamp": datetime.now(timezone.utc).isoformat()},
+            {"test_name": "Hemoglobin", "value": "14.2", "unit": "g/dL", "reference_range": "12-17", "status": "normal", "timestamp": datetime.now(timezone.utc).isoformat()},
+            {"test_name": "WBC", "value": "7.5", "unit": "K/uL", "reference_range": "4.5-11", "status": "normal", "timestamp": datetime.now(timezone.utc).isoformat()},
+            {"test_name": "Creatinine", "value": "1.1", "unit": "mg/dL", "reference_range": "0.7-1.3", "status": "normal", "timestamp": datetime.now(timezone.utc).isoformat()},
+            {"test_name": "Potassium", "value": "5.2", "unit": "mEq/L", "reference_range": "3.5-5.0", "status": "high", "timestamp": datetime.now(timezone.utc).isoformat()},
         ]
     }
 
@@ -8073,10 +8264,10 @@ async def get_nurse_alerts(
     # In production, alerts would be generated from real patient encounters
     return {
         "alerts": [
-            {"id": "ALT-001", "type": "high_risk", "message": "[DEMO] Patient flagged high risk - physician notified", "priority": "high", "timestamp": datetime.now().isoformat(), "acknowledged": False, "is_demo": True},
-            {"id": "ALT-002", "type": "followup", "message": "[DEMO] Follow-up required - BP check in 2 hours", "priority": "medium", "timestamp": datetime.now().isoformat(), "acknowledged": False, "is_demo": True},
-            {"id": "ALT-003", "type": "medication", "message": "[DEMO] Medication due at 3:00 PM", "priority": "medium", "timestamp": datetime.now().isoformat(), "acknowledged": True, "is_demo": True},
-            {"id": "ALT-004", "type": "vitals", "message": "[DEMO] Elevated temperature (100.4°F)", "priority": "high", "timestamp": datetime.now().isoformat(), "acknowledged": False, "is_demo": True},
+            {"id": "ALT-001", "type": "high_risk", "message": "[DEMO] Patient flagged high risk - physician notified", "priority": "high", "timestamp": datetime.now(timezone.utc).isoformat(), "acknowledged": False, "is_demo": True},
+            {"id": "ALT-002", "type": "followup", "message": "[DEMO] Follow-up required - BP check in 2 hours", "priority": "medium", "timestamp": datetime.now(timezone.utc).isoformat(), "acknowledged": False, "is_demo": True},
+            {"id": "ALT-003", "type": "medication", "message": "[DEMO] Medication due at 3:00 PM", "priority": "medium", "timestamp": datetime.now(timezone.utc).isoformat(), "acknowledged": True, "is_demo": True},
+            {"id": "ALT-004", "type": "vitals", "message": "[DEMO] Elevated temperature (100.4°F)", "priority": "high", "timestamp": datetime.now(timezone.utc).isoformat(), "acknowledged": False, "is_demo": True},
         ],
         "total": 4,
         "note": "Demo alerts shown. Real alerts generated from finalized encounters."
@@ -8114,8 +8305,8 @@ async def get_patient_care_notes(
     return {
         "patient_id": patient_id,
         "notes": [
-            {"id": "NOTE-001", "note": "Patient resting comfortably. No complaints of pain.", "created_by": "Nurse Williams", "timestamp": datetime.now().isoformat(), "category": "observation"},
-            {"id": "NOTE-002", "note": "Assisted with ambulation. Tolerated well.", "created_by": "Nurse Johnson", "timestamp": (datetime.now() - timedelta(hours=2)).isoformat(), "category": "task"},
+            {"id": "NOTE-001", "note": "Patient resting comfortably. No complaints of pain.", "created_by": "Nurse Williams", "timestamp": datetime.now(timezone.utc).isoformat(), "category": "observation"},
+            {"id": "NOTE-002", "note": "Assisted with ambulation. Tolerated well.", "created_by": "Nurse Johnson", "timestamp": (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat(), "category": "task"},
         ]
     }
 
@@ -8147,7 +8338,7 @@ async def add_patient_care_note(
         "status": "created",
         "note_id": note_id,
         "patient_id": patient_id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -8158,7 +8349,7 @@ async def add_patient_care_note(
 @app.get("/encounters/test-endpoint")
 async def test_encounter_endpoint():
     """Simple test to verify encounters endpoint is reachable"""
-    return {"status": "ok", "message": "Encounters endpoint is working", "version": "v3-dict-body", "timestamp": datetime.now().isoformat()}
+    return {"status": "ok", "message": "Encounters endpoint is working", "version": "v3-dict-body", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
 @app.post("/encounters/test-post")
@@ -8177,13 +8368,20 @@ async def create_draft_simple(body: dict):
             "encounter_id": encounter_id,
             "patient_id": patient_id,
             "status": "draft",
-            "created_at": datetime.now().isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
             "reused": False
         }
     except Exception as e:
         return {"error": str(e), "encounter_id": f"ENC-ERR-{uuid.uuid4().hex[:8].upper()}"}
 
 
+# Draft encounter opened for each risk assessment
+RISK_ENCOUNTER_INSERT_QUERY = register_hot_query("""
+    INSERT INTO encounters (encounter_id, patient_id, created_by, created_by_role, created_at, encounter_type, status, notes)
+    VALUES (?, ?, ?, ?, ?, 'risk_assessment', 'draft', '')
+""")
+
+
 @app.post("/encounters/find-or-create-draft")
 async def find_or_create_draft_encounter(
     body: dict,
@@ -8194,14 +8392,11 @@ async def find_or_create_draft_encounter(
     try:
         patient_id = body.get("patient_id", "unknown")
         encounter_id = f"ENC-{uuid.uuid4().hex[:12].upper()}"
-        timestamp = datetime.now().isoformat()
+        timestamp = datetime.now(timezone.utc).isoformat()
         
         # Try to save to database (optional - works without it)
         try:
-            execute_query("""
-                INSERT INTO encounters (encounter_id, patient_id, created_by, created_by_role, created_at, encounter_type, status, notes)
-                VALUES (?, ?, ?, ?, ?, 'risk_assessment', 'draft', '')
-            """, (encounter_id, patient_id, user_id or "anonymous", user_role or "doctor", timestamp))
+            execute_query(RISK_ENCOUNTER_INSERT_QUERY, (encounter_id, patient_id, user_id or "anonymous", user_role or "doctor", timestamp))
         except:
             pass  # Database save is optional
         
@@ -8217,7 +8412,7 @@ async def find_or_create_draft_encounter(
         return {
             "encounter_id": f"ENC-{uuid.uuid4().hex[:12].upper()}",
             "patient_id": "unknown",
-            "created_at": datetime.now().isoformat(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
             "status": "draft",
             "reused": False,
             "error": str(e)
@@ -8251,7 +8446,7 @@ async def save_encounter_prediction(
     prediction_json = json.dumps(request.get("prediction", {}))
     patient_summary_json = json.dumps(request.get("patient_summary", {}))
     visibility = request.get("visibility", "patient_visible")
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     try:
         # Check if encounter is completed (frozen)
@@ -8308,7 +8503,7 @@ async def save_encounter_genetic(
     confidence = request.get("confidence", 0.0)
     result_json = json.dumps(request.get("result", {}))
     visibility = request.get("visibility", "clinician_only")
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     try:
         execute_query("""
@@ -8417,7 +8612,7 @@ async def save_encounter_genetics(
     prs_percentiles = request.get("prs_percentiles", {})
     high_impact_flags = request.get("high_impact_flags", {})
     qc_data = request.get("qc", {})
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     # Check encounter status
     try:
@@ -8678,7 +8873,7 @@ async def import_genetic_results(
     high_impact = results.get("high_impact_variants", {})
     qc_data = results.get("qc", {})
     
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     # Validate required fields
     if not prs_data and not high_impact:
@@ -9056,7 +9251,7 @@ async def save_encounter_imaging(
     finding_summary = request.get("finding_summary", "")
     result_json = json.dumps(request.get("result", {}))
     visibility = request.get("visibility", "clinician_only")
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     try:
         execute_query("""
@@ -9086,7 +9281,7 @@ async def save_encounter_ai_note(
     response_summary = request.get("response_summary", "")
     result_json = json.dumps(request.get("result", {}))
     visibility = request.get("visibility", "clinician_only")
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     try:
         execute_query("""
@@ -9109,7 +9304,7 @@ async def complete_encounter(
     if user_role.lower() not in ['doctor', 'admin']:
         raise HTTPException(status_code=403, detail="Only doctors can complete encounters")
     
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     
     try:
         execute_query("""
@@ -9213,7 +9408,7 @@ async def get_encounter_timeline(
         return {
             "encounter_id": encounter_id,
             "timeline": [
-                {"type": "encounter_start", "timestamp": datetime.now().isoformat(), "created_by": user_id, "data": {"status": "demo"}}
+                {"type": "encounter_start", "timestamp": datetime.now(timezone.utc).isoformat(), "created_by": user_id, "data": {"status": "demo"}}
             ],
             "total_items": 1,
             "note": "Demo mode - no persisted data"
@@ -20,7 +20,7 @@ from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import numpy as np
 import pickle
 import json
@@ -261,7 +261,7 @@ async def predict_all_diseases(
     
     return MultiDiseaseResponse(
         patient_id=patient_id,
-        timestamp=datetime.now().isoformat(),
+        timestamp=datetime.now(timezone.utc).isoformat(),
         predictions=formatted_predictions,
         summary=summary,
         privacy_note="Prediction performed locally. No data sent to external servers."
@@ -297,7 +297,7 @@ async def predict_single_disease(
         "risk_category": pred["risk_category"],
         "confidence": pred["confidence"],
         "top_factors": pred["top_factors"],
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -323,7 +323,7 @@ async def calculate_all_prs(genotypes: GenotypeInput):
     return {
         "ancestry": genotypes.ancestry,
         "prs_results": results,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "privacy_note": "Genetic analysis performed locally. Raw genotypes not stored."
     }
 
@@ -352,7 +352,7 @@ async def calculate_category_prs(
         "category": category,
         "ancestry": genotypes.ancestry,
         "result": result,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -473,7 +473,7 @@ async def generate_llm_report(request: LLMReportRequest):
                 "model": "qwen3:8b",
                 "style": request.report_style,
                 "generated_locally": True,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
         else:
             raise HTTPException(status_code=503, detail="LLM service unavailable")
@@ -485,7 +485,7 @@ async def generate_llm_report(request: LLMReportRequest):
             "style": request.report_style,
             "generated_locally": True,
             "note": "LLM unavailable - using template report",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 
@@ -561,7 +561,7 @@ async def health_check():
         "status": "healthy",
         "models_loaded": predictor is not None and predictor.is_trained,
         "prs_ready": prs_calculator is not None,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -14,7 +14,7 @@ import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import pickle
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
@@ -143,7 +143,7 @@ class HospitalNode:
         # Store in local history
         self.training_history.append({
             'disease_id': disease_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'n_samples': len(y),
             'local_accuracy': local_accuracy,
             'local_auc': local_auc,
@@ -311,7 +311,7 @@ class MultiDiseaseFederatedCoordinator:
         # Store training record
         training_record = {
             'disease_id': disease_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'n_rounds': n_rounds,
             'n_hospitals': len(self.hospitals),
             'dp_config': {
@@ -397,7 +397,7 @@ class MultiDiseaseFederatedCoordinator:
     def get_privacy_report(self) -> Dict[str, Any]:
         """Generate privacy compliance report"""
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'framework': 'Federated Learning with Differential Privacy',
             'data_sharing': {
                 'raw_data_shared': False,
@@ -5,13 +5,13 @@ Implements HIPAA Right of Access and GDPR Data Portability
 
 import json
 import base64
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 import hashlib
 
 def generate_share_token() -> str:
     """Generate secure token for data sharing links"""
-    timestamp = datetime.now().isoformat()
+    timestamp = datetime.now(timezone.utc).isoformat()
     random_str = hashlib.sha256(timestamp.encode()).hexdigest()[:16]
     return f"SHARE-{random_str.upper()}"
 
@@ -30,7 +30,7 @@ def create_patient_data_package(patient_id: str, patient_data: Dict[str, Any]) -
     package = {
         "metadata": {
             "patient_id": patient_id,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
             "format_version": "1.0.0",
             "hipaa_compliant": True,
             "gdpr_compliant": True
@@ -77,7 +77,7 @@ def export_as_fhir(patient_id: str, patient_data: Dict[str, Any]) -> Dict[str, A
     bundle = {
         "resourceType": "Bundle",
         "type": "collection",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "entry": []
     }
     
@@ -264,7 +264,7 @@ def generate_pdf_content(patient_data: Dict[str, Any]) -> str:
         <div class="header">
             <h1>📋 Medical Records</h1>
             <p style="margin: 10px 0 0 0;">Patient: {patient_data.get('name', 'N/A')}</p>
-            <p style="margin: 5px 0 0 0; font-size: 14px;">Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
+            <p style="margin: 5px 0 0 0; font-size: 14px;">Generated: {datetime.now(timezone.utc).strftime('%B %d, %Y at %I:%M %p UTC')}</p>
         </div>
         
         <div class="section">
@@ -380,7 +380,7 @@ def generate_pdf_content(patient_data: Dict[str, Any]) -> str:
         <div class="footer">
             <p><strong>BioTeK Privacy-First Healthcare Platform</strong></p>
             <p>This document contains confidential patient information protected under HIPAA.</p>
-            <p>Generated on {datetime.now().strftime('%B %d, %Y')}</p>
+            <p>Generated on {datetime.now(timezone.utc).strftime('%B %d, %Y')}</p>
         </div>
     </body>
     </html>
@@ -400,13 +400,13 @@ def create_shareable_link(patient_id: str, share_token: str, expires_hours: int
     Returns:
         Share link information
     """
-    expires_at = datetime.now() + timedelta(hours=expires_hours)
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=expires_hours)
     
     return {
         "share_token": share_token,
         "share_url": f"https://biotek.com/shared/{share_token}",
         "patient_id": patient_id,
-        "created_at": datetime.now().isoformat(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
         "expires_at": expires_at.isoformat(),
         "access_count": 0,
         "max_accesses": 1  # One-time access by default
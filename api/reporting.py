@@ -4,7 +4,7 @@ Generates compliance reports, usage statistics, and security analytics
 """
 
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any
 from pathlib import Path
 import json
@@ -114,14 +114,16 @@ def get_hourly_activity(hours: int = 24) -> List[Dict[str, Any]]:
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    start_time = (datetime.now() - timedelta(hours=hours)).isoformat()
+    # Rows mix naive and offset-suffixed ISO strings; datetime() folds both
+    # sides to 'YYYY-MM-DD HH:MM:SS' UTC so the comparison is not lexical
+    start_time = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
     
     cursor.execute("""
         SELECT strftime('%Y-%m-%d %H:00:00', timestamp) as hour,
                COUNT(*) as count,
                SUM(CASE WHEN granted = 1 THEN 1 ELSE 0 END) as granted
         FROM access_log
-        WHERE timestamp >= ?
+        WHERE datetime(timestamp) >= datetime(?)
         GROUP BY hour
         ORDER BY hour DESC
         LIMIT ?
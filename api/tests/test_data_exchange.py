@@ -0,0 +1,66 @@
+"""
+Tests for batch data exchange packages
+
+Tests:
+1. Batch packages expire EXCHANGE_PACKAGE_TTL after creation
+2. A batch survives encrypt_data_for_exchange / open_exchange_packages
+3. Expired batches are rejected on receipt
+"""
+
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+pytest.importorskip("cryptography")
+pytest.importorskip("bcrypt")
+pytest.importorskip("jose")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import data_exchange
+from data_exchange import (
+    create_exchange_packages, encrypt_data_for_exchange, open_exchange_packages,
+    DataCategory, EXCHANGE_PACKAGE_TTL
+)
+
+
+PATIENTS = [
+    {"patient_id": "PAT-1", "name": "A", "medications": ["Metformin"], "lab_results": [{"test": "HbA1c", "value": 7.2}]},
+    {"patient_id": "PAT-2", "name": "B", "medications": [], "lab_results": [{"test": "LDL", "value": 130.5}]},
+]
+CATEGORIES = [DataCategory.MEDICATIONS, DataCategory.LAB_RESULTS]
+
+
+def _package():
+    return create_exchange_packages(PATIENTS, "EXC-BATCH", "BIOTEK-MAIN", "HOSP-1", "treatment", CATEGORIES)
+
+
+class TestBatchExchange:
+    """create_exchange_packages / open_exchange_packages round trip"""
+    
+    def test_package_expires_after_ttl(self):
+        """expires_at is a real expiry, not the creation time"""
+        metadata = _package()["metadata"]
+        created_at = datetime.fromisoformat(metadata["created_at"])
+        expires_at = datetime.fromisoformat(metadata["expires_at"])
+        
+        assert expires_at - created_at == EXCHANGE_PACKAGE_TTL
+        assert metadata["patient_count"] == 2
+    
+    def test_round_trip(self):
+        """Recipient gets the minimized records back in order"""
+        records = open_exchange_packages(encrypt_data_for_exchange(_package()))
+        
+        assert [record["patient_id"] for record in records] == ["PAT-1", "PAT-2"]
+        assert records[0]["data"] == {"medications": ["Metformin"], "lab_results": [{"test": "HbA1c", "value": 7.2}]}
+        assert "name" not in records[1]["data"]
+    
+    def test_expired_package_rejected(self, monkeypatch):
+        """Packages past expires_at raise ValueError"""
+        monkeypatch.setattr(data_exchange, "EXCHANGE_PACKAGE_TTL", timedelta(seconds=-1))
+        encrypted = encrypt_data_for_exchange(_package())
+        
+        with pytest.raises(ValueError, match="expired"):
+            open_exchange_packages(encrypted)
@@ -0,0 +1,71 @@
+"""
+Tests for federated weight serialization
+
+Tests:
+1. Full weights survive a serialize/deserialize round trip
+2. Compressed (top-k int8) updates survive a round trip
+3. The header carries no executable payload (plain JSON)
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from federated_learning import (
+    compress_delta, serialize_weights, deserialize_weights, WEIGHT_DTYPE
+)
+
+
+def _full_weights():
+    return {
+        'coef': np.arange(12, dtype=WEIGHT_DTYPE).reshape(1, 12) / 7,
+        'intercept': np.array([0.25], dtype=WEIGHT_DTYPE),
+        'classes': np.array([0, 1]),
+        'num_samples': 500
+    }
+
+
+class TestWeightSerialization:
+    """Round trips through serialize_weights / deserialize_weights"""
+    
+    def test_full_weights_round_trip(self):
+        """Arrays keep their values, dtypes and shapes; scalars pass through"""
+        weights = _full_weights()
+        header, buffers = serialize_weights(weights)
+        restored = deserialize_weights(header, [bytes(b) for b in buffers])
+        
+        assert restored.keys() == weights.keys()
+        for key in ('coef', 'intercept', 'classes'):
+            assert restored[key].dtype == weights[key].dtype
+            assert restored[key].shape == weights[key].shape
+            np.testing.assert_array_equal(restored[key], weights[key])
+        assert restored['num_samples'] == 500
+    
+    def test_compressed_update_round_trip(self):
+        """Tuples from compress_delta come back as tuples of the same parts"""
+        delta = np.linspace(-1, 1, 12, dtype=WEIGHT_DTYPE).reshape(1, 12)
+        weights = {'coef_delta': compress_delta(delta, 0.5), 'num_samples': 10}
+        header, buffers = serialize_weights(weights)
+        restored = deserialize_weights(header, [bytes(b) for b in buffers])
+        
+        indices, values, scale = restored['coef_delta']
+        expected = weights['coef_delta']
+        np.testing.assert_array_equal(indices, expected[0])
+        np.testing.assert_array_equal(values, expected[1])
+        assert values.dtype == np.int8
+        assert scale == pytest.approx(expected[2])
+    
+    def test_header_is_plain_json(self):
+        """Header is JSON with dtype/shape metadata, not a pickle"""
+        header, buffers = serialize_weights(_full_weights())
+        decoded = json.loads(header)
+        
+        assert decoded['coef'] == {'array': 0, 'dtype': np.dtype(WEIGHT_DTYPE).str, 'shape': [1, 12]}
+        assert len(buffers) == 3
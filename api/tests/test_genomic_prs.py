@@ -0,0 +1,63 @@
+"""
+Tests for batch PRS scoring
+
+Tests:
+1. score_cohort_fast (NumPy fallback) matches calculate_prs per patient
+2. The Numba kernel, when installed, matches calculate_prs per patient
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+np = pytest.importorskip("numpy")
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import genomic_prs
+from genomic_prs import GenomicRiskCalculator
+
+
+@pytest.fixture
+def calculator():
+    return GenomicRiskCalculator()
+
+
+@pytest.fixture
+def dosage_matrix(calculator):
+    """A few patients: all-zero, all-two and mixed dosages"""
+    n_snps = len(calculator.snps)
+    rows = [
+        np.zeros(n_snps, dtype=np.uint8),
+        np.full(n_snps, 2, dtype=np.uint8),
+        np.arange(n_snps, dtype=np.uint8) % 3,
+        (np.arange(n_snps, dtype=np.uint8) + 1) % 3,
+    ]
+    return np.stack(rows)
+
+
+def _expected(calculator, dosage_matrix):
+    return [calculator.calculate_prs(row, detailed=False)['prs_normalized'] for row in dosage_matrix]
+
+
+class TestBatchScoring:
+    """score_cohort_fast agrees with the single-patient calculate_prs"""
+    
+    def test_numpy_fallback_matches_calculate_prs(self, calculator, dosage_matrix, monkeypatch):
+        """Fallback path: score_cohort() / max_possible_score"""
+        monkeypatch.setattr(genomic_prs, "NUMBA_AVAILABLE", False)
+        scores = calculator.score_cohort_fast(dosage_matrix)
+        
+        assert scores.shape == (len(dosage_matrix),)
+        assert scores.tolist() == pytest.approx(_expected(calculator, dosage_matrix), rel=1e-12)
+        assert scores[0] == 0.0
+        assert scores[1] == pytest.approx(1.0, rel=1e-12)
+    
+    def test_numba_kernel_matches_calculate_prs(self, calculator, dosage_matrix):
+        """Numba path (skipped when numba is not installed)"""
+        if not genomic_prs.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+        scores = calculator.score_cohort_fast(dosage_matrix)
+        
+        assert scores.tolist() == pytest.approx(_expected(calculator, dosage_matrix), rel=1e-12)